@@ -0,0 +1,204 @@
+"""Анализ позиций: лучший ход, проверка мата и perft.
+
+Функции работают с доской через make/unmake без копирования и понимают
+все варианты игры из `session.VARIANTS`: ходы, продолжение серии взятий,
+шах, пат и стоимость фигур берутся из объекта правил (`Rules`). Каждое
+взятие серии в шашках — отдельный полуход.
+
+`run_job` принимает задание в виде кортежа из встроенных типов и
+предназначен для запуска в пуле процессов (см. `analysis_queue`).
+"""
+
+from typing import Dict, Optional, Tuple
+
+from session import VARIANTS, Rules, opponent
+
+Position = Tuple[int, int]
+Move = Tuple[Position, ...]
+
+BEST_MOVE = 'best_move'
+MATE_CHECK = 'mate_check'
+PERFT = 'perft'
+KINDS = (BEST_MOVE, MATE_CHECK, PERFT)
+
+MATE_SCORE = 100_000
+
+_rules: Dict[str, Rules] = {}
+
+
+def check_depth(kind: str, depth: int):
+    """Проверяет глубину задания.
+
+    Аргументы:
+        kind (str): Вид задания из KINDS.
+        depth (int): Глубина.
+
+    Исключения:
+        ValueError: Глубина BEST_MOVE меньше 1 или глубина PERFT отрицательна.
+    """
+    if kind == BEST_MOVE and depth < 1:
+        raise ValueError(f"Глубина поиска лучшего хода должна быть не меньше 1: {depth}")
+    if kind == PERFT and depth < 0:
+        raise ValueError(f"Глубина perft не может быть отрицательной: {depth}")
+
+
+def _play(rules: Rules, board, color: str, move: Move, captures: bool):
+    """Выполняет ход и возвращает (запись отмены, кто ходит дальше, клетка продолжения серии)."""
+    undo = board.make_move(*move)
+    if rules.continues(board, move[-1], captures):
+        return undo, color, move[-1]
+    return undo, opponent(color), None
+
+
+def evaluate(rules: Rules, board, color: str) -> int:
+    """Оценивает позицию по материалу с точки зрения стороны `color`.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        board: Доска.
+        color (str): Сторона, для которой считается оценка.
+
+    Возвращает:
+        int: Разность стоимости своих фигур и фигур противника.
+    """
+    values = rules.piece_values
+    score = 0
+    for line in board.board:
+        for piece in line:
+            if piece is not None:
+                value = values.get(piece.get_symbol().upper(), 0)
+                score += value if piece.color == color else -value
+    return score
+
+
+def _search(rules: Rules, board, color: str, pending: Optional[Position], depth: int, alpha: int, beta: int) -> int:
+    """Перебор negamax с альфа-бета отсечением; продолжение серии взятий не расходует глубину."""
+    moves, captures = rules.search_moves(board, color, pending)
+    if not moves:
+        return 0 if rules.is_stalemate(board, color) else -(MATE_SCORE + depth)
+    if depth == 0:
+        return evaluate(rules, board, color)
+
+    best = -(MATE_SCORE * 2)
+    for move in moves:
+        undo, next_color, next_pending = _play(rules, board, color, move, captures)
+        if next_color == color:
+            score = _search(rules, board, color, next_pending, depth, alpha, beta)
+        else:
+            score = -_search(rules, board, next_color, next_pending, depth - 1, -beta, -alpha)
+        board.unmake_move(undo)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+    return best
+
+
+def best_move(rules: Rules, board, color: str, depth: int = 2,
+              pending: Optional[Position] = None) -> Optional[Tuple[Move, int]]:
+    """Ищет лучший ход перебором на заданную глубину.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        board: Доска (после поиска остается в исходном состоянии).
+        color (str): Сторона, которая ходит.
+        depth (int): Глубина перебора в полуходах (не меньше 1).
+        pending (Optional[Position]): Клетка шашки, продолжающей серию взятий.
+
+    Возвращает:
+        Optional[Tuple[Move, int]]: (ход, оценка) или None, если ходов нет. Ход — пара клеток
+            или тройка клеток двухшагового хода.
+
+    Исключения:
+        ValueError: Глубина меньше 1.
+    """
+    check_depth(BEST_MOVE, depth)
+    moves, captures = rules.search_moves(board, color, pending)
+    best = None
+    alpha, beta = -(MATE_SCORE * 2), MATE_SCORE * 2
+    for move in moves:
+        undo, next_color, next_pending = _play(rules, board, color, move, captures)
+        if next_color == color:
+            score = _search(rules, board, color, next_pending, depth, alpha, beta)
+        else:
+            score = -_search(rules, board, next_color, next_pending, depth - 1, -beta, -alpha)
+        board.unmake_move(undo)
+        if best is None or score > best[1]:
+            best = (tuple(move), score)
+            alpha = max(alpha, score)
+    return best
+
+
+def mate_check(rules: Rules, board, color: str, pending: Optional[Position] = None) -> Dict[str, bool]:
+    """Определяет состояние стороны, которая ходит.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        board: Доска.
+        color (str): Сторона, которая ходит.
+        pending (Optional[Position]): Клетка шашки, продолжающей серию взятий.
+
+    Возвращает:
+        Dict[str, bool]: 'check' — король под шахом, 'checkmate' — ходов нет и партия
+            проиграна, 'stalemate' — ходов нет, но и поражения нет.
+    """
+    check = rules.in_check(board, color)
+    moves, _ = rules.search_moves(board, color, pending)
+    if moves:
+        return {'check': check, 'checkmate': False, 'stalemate': False}
+    draw = rules.is_stalemate(board, color)
+    return {'check': check, 'checkmate': not draw, 'stalemate': draw}
+
+
+def perft(rules: Rules, board, color: str, depth: int, pending: Optional[Position] = None) -> int:
+    """Считает количество позиций на глубине `depth` полуходов.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        board: Доска (после подсчета остается в исходном состоянии).
+        color (str): Сторона, которая ходит.
+        depth (int): Глубина в полуходах.
+        pending (Optional[Position]): Клетка шашки, продолжающей серию взятий.
+
+    Возвращает:
+        int: Количество листьев дерева ходов.
+    """
+    if depth == 0:
+        return 1
+    moves, captures = rules.search_moves(board, color, pending)
+    nodes = 0
+    for move in moves:
+        undo, next_color, next_pending = _play(rules, board, color, move, captures)
+        nodes += perft(rules, board, next_color, depth - 1, next_pending)
+        board.unmake_move(undo)
+    return nodes
+
+
+def run_job(job: tuple):
+    """Выполняет задание анализа.
+
+    Аргументы:
+        job (tuple): (вид задания из KINDS, вариант из `session.VARIANTS`, упакованная доска,
+            сторона, которая ходит, клетка продолжения серии или None, глубина).
+
+    Возвращает:
+        Результат `best_move`, `mate_check` или `perft`.
+
+    Исключения:
+        ValueError: Неизвестный вид задания или недопустимая глубина.
+    """
+    kind, variant, packed, color, pending, depth = job
+    check_depth(kind, depth)
+    rules = _rules.get(variant)
+    if rules is None:
+        rules = _rules[variant] = VARIANTS[variant]()
+    board = rules.board_type.unpack(packed)
+    if kind == BEST_MOVE:
+        return best_move(rules, board, color, depth, pending)
+    if kind == MATE_CHECK:
+        return mate_check(rules, board, color, pending)
+    if kind == PERFT:
+        return perft(rules, board, color, depth, pending)
+    raise ValueError(f"Неизвестный вид анализа: {kind}")
@@ -0,0 +1,219 @@
+"""Асинхронная очередь заданий анализа с пулом процессов и кэшем результатов.
+
+`AnalysisQueue` принимает задания (лучший ход, проверка мата, perft) из
+корутин, ставит их в очередь и выполняет в пуле процессов (`analysis.run_job`),
+не блокируя цикл событий. Одинаковые задания, которые уже выполняются, не
+запускаются повторно: все ожидающие получают один результат. Готовые
+результаты хранятся в кэше с ограниченным временем жизни. `metrics()`
+возвращает глубину очереди, число попаданий в кэш и задержки.
+
+Пример:
+    async with AnalysisQueue(workers=4) as queue:
+        move = await queue.best_move('chess', board, 'white', depth=3)
+        print(queue.metrics())
+"""
+
+import asyncio
+import os
+from collections import OrderedDict, deque
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from analysis import BEST_MOVE, KINDS, MATE_CHECK, PERFT, check_depth, run_job
+from session import VARIANTS
+
+Position = Tuple[int, int]
+
+
+class AnalysisQueue:
+    """Очередь заданий анализа.
+
+    Атрибуты:
+        workers (int): Количество одновременно выполняемых заданий.
+        ttl (float): Время жизни результата в кэше, секунды.
+        cache_size (int): Наибольшее количество результатов в кэше.
+    """
+
+    def __init__(self, workers: Optional[int] = None, ttl: float = 60.0, cache_size: int = 4096, executor=None):
+        """Инициализирует очередь; задания начинают выполняться после `start`.
+
+        Аргументы:
+            workers (Optional[int]): Количество процессов; по умолчанию — число процессоров.
+            ttl (float): Время жизни результата в кэше, секунды.
+            cache_size (int): Наибольшее количество результатов в кэше.
+            executor: Готовый исполнитель (`concurrent.futures.Executor`); по умолчанию
+                создается `ProcessPoolExecutor`, который закрывается в `close`.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatchers = []
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._cache: 'OrderedDict[tuple, Tuple[float, object]]' = OrderedDict()
+        self._running = 0
+        self._latencies = deque(maxlen=1024)
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'cache_hits': 0, 'deduplicated': 0}
+
+    async def start(self):
+        """Создает пул процессов и запускает обработчики очереди."""
+        if self._queue is not None:
+            return
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Останавливает обработчики и пул процессов; невыполненные задания отменяются."""
+        if self._queue is None:
+            return
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        for future in self._inflight.values():
+            if not future.done():
+                future.cancel()
+        self._inflight.clear()
+        self._dispatchers = []
+        self._queue = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _dispatch(self):
+        """Берет задания из очереди и выполняет их в пуле процессов."""
+        loop = asyncio.get_running_loop()
+        while True:
+            key, future = await self._queue.get()
+            self._running += 1
+            try:
+                result = await loop.run_in_executor(self._executor, run_job, key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self._counters['failed'] += 1
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                self._counters['completed'] += 1
+                self._store(key, result)
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._running -= 1
+                self._inflight.pop(key, None)
+                self._queue.task_done()
+
+    def _lookup(self, key: tuple):
+        """Возвращает (True, результат) из кэша или (False, None), удаляя устаревшую запись."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires, result = entry
+        if expires < monotonic():
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, result
+
+    def _store(self, key: tuple, result):
+        """Сохраняет результат в кэш, вытесняя самые старые записи."""
+        self._cache[key] = (monotonic() + self.ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def submit(self, kind: str, variant: str, board, color: str = 'white', depth: int = 1,
+                     pending: Optional[Position] = None):
+        """Ставит задание в очередь и ожидает результат.
+
+        Аргументы:
+            kind (str): BEST_MOVE, MATE_CHECK или PERFT.
+            variant (str): Вариант игры из `session.VARIANTS`.
+            board: Доска (копируется в упакованном виде; после вызова ее можно изменять).
+            color (str): Сторона, которая ходит.
+            depth (int): Глубина перебора (не используется для MATE_CHECK).
+            pending (Optional[Position]): Клетка шашки, продолжающей серию взятий.
+
+        Возвращает:
+            Результат `analysis.run_job`.
+
+        Исключения:
+            ValueError: Неизвестный вид задания или вариант игры, недопустимая глубина.
+            RuntimeError: Очередь не запущена.
+        """
+        if kind not in KINDS or variant not in VARIANTS:
+            raise ValueError(f"Неизвестное задание анализа: {kind} для {variant}")
+        check_depth(kind, depth)
+        if self._queue is None:
+            raise RuntimeError("Очередь анализа не запущена")
+        started = monotonic()
+        self._counters['submitted'] += 1
+        key = (kind, variant, board.pack(), color, pending, 0 if kind == MATE_CHECK else depth)
+
+        found, result = self._lookup(key)
+        if found:
+            self._counters['cache_hits'] += 1
+            self._latencies.append(monotonic() - started)
+            return result
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._queue.put_nowait((key, future))
+        else:
+            self._counters['deduplicated'] += 1
+        result = await asyncio.shield(future)
+        self._latencies.append(monotonic() - started)
+        return result
+
+    async def best_move(self, variant: str, board, color: str = 'white', depth: int = 2,
+                        pending: Optional[Position] = None):
+        """Ищет лучший ход (см. `analysis.best_move`)."""
+        return await self.submit(BEST_MOVE, variant, board, color, depth, pending)
+
+    async def mate_check(self, variant: str, board, color: str = 'white', pending: Optional[Position] = None):
+        """Проверяет шах, мат и пат (см. `analysis.mate_check`)."""
+        return await self.submit(MATE_CHECK, variant, board, color, 0, pending)
+
+    async def perft(self, variant: str, board, color: str = 'white', depth: int = 1,
+                    pending: Optional[Position] = None):
+        """Считает perft (см. `analysis.perft`)."""
+        return await self.submit(PERFT, variant, board, color, depth, pending)
+
+    def metrics(self) -> Dict[str, float]:
+        """Возвращает метрики очереди.
+
+        Возвращает:
+            Dict[str, float]: queue_depth (ожидают выполнения), running (выполняются),
+                счетчики submitted/completed/failed/cache_hits/deduplicated, размер кэша и
+                задержки ответа p50/p99/max в миллисекундах по последним 1024 запросам.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1e3
+
+        return dict(
+            self._counters,
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            running=self._running,
+            cached=len(self._cache),
+            latency_p50_ms=percentile(0.50),
+            latency_p99_ms=percentile(0.99),
+            latency_max_ms=latencies[-1] * 1e3 if latencies else 0.0,
+        )
@@ -1,63 +1,29 @@
-import chess
+import sys
+from typing import Optional
 
-def main():
+import console
+from session import ChessRules, GameSession
+
+def main(log_path: Optional[str] = None):
     """Основная функция для запуска шахматной игры.
 
     Инициализирует шахматную доску, управляет ходами игроков и отображает состояние доски.
     Игроки поочередно вводят координаты для выполнения ходов.
-    """
-    board = chess.Board()
-    move_counter = 0
-    current_player = 'white'
-    print("Начальная доска:")
-    print(board)
-    
-    while True:
-        def interpretator(coord):
-            """Преобразует координаты шахматной доски в индексы массива.
-
-            Аргументы:
-                coord (str): Координата на шахматной доске в формате 'a1', 'b2' и т.д.
 
-            Возвращает:
-                tuple: Кортеж с индексами (строка, столбец) или None, если координаты некорректны.
-            """
-            if len(coord) != 2:
-                return None
-            x = ord(coord[0]) - ord('a')
-            y = 8 - int(coord[1])
-            if 0 <= x < 8 and 0 <= y < 8:
-                return (y, x)
-            return None
-        
-        print(f"Сейчас ходят {'черные' if current_player == 'black' else 'белые'}.")
-        start_pos = interpretator(input('Введите координату фигуры, которой хотите воспользоваться (например, a2): '))
-        end_pos = interpretator(input('Введите координату, куда хотите ее передвинуть (например, a4): '))
-        
-        if start_pos is None or end_pos is None:
-            print("Некорректные координаты. Попробуйте снова.")
-            continue
-        
-        piece = board.get_piece(start_pos)
-        if piece is None or piece.color != current_player:
-            print(f"Вы не можете ходить фигурой противника или пустой клеткой.")
-            continue
-        
-        if not board.move_piece(start_pos, end_pos):
-            print("Невозможно выполнить ход.")
-            continue
-
-        print("\nДоска после хода:")
-        print(board)
-        
-        opponent = 'black' if current_player == 'white' else 'white'
-        if board.is_check(opponent):
-            print(f"Король {'черных' if opponent == 'black' else 'белых'} под шахом!")
-
-        current_player = 'black' if current_player == 'white' else 'white'
-        
-        move_counter += 1
-        print(f'Количество ходов: {move_counter}')
+    Аргументы:
+        log_path (Optional[str]): Путь к журналу ходов. Если журнал уже существует,
+            партия продолжается с сохраненной позиции.
+    """
+    if log_path is None:
+        session = GameSession(ChessRules())
+    else:
+        import persistence
+        session = persistence.open_session(log_path, ChessRules(), sync=persistence.ALWAYS)
+    try:
+        console.run(session, "Начальная доска:")
+    finally:
+        if session.journal is not None:
+            session.journal.close()
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
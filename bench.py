@@ -0,0 +1,176 @@
+"""Замер пропускной способности: партии со случайными допустимыми ходами.
+
+Каждая партия играется через `GameSession` до конца (нет допустимых ходов,
+взят король или достигнут лимит полуходов) с генератором случайных чисел,
+зависящим только от seed и номера партии, поэтому повторный запуск играет те
+же партии. Контрольная сумма итоговых позиций в отчете позволяет убедиться,
+что сравниваются одинаковые партии.
+
+Запуск:
+    python bench.py --variant chess --games 50 --seed 1
+    python bench.py --variant checkers --script games.txt
+"""
+
+import random
+import zlib
+from time import perf_counter_ns
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from session import VARIANTS, GameSession, Rules
+
+
+def play_random_game(rules: Rules, rng: random.Random, max_plies: int, latencies: List[int]) -> GameSession:
+    """Играет одну партию случайными допустимыми ходами.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        rng (random.Random): Генератор случайных чисел партии.
+        max_plies (int): Максимальное количество полуходов (каждое взятие серии считается отдельно).
+        latencies (List[int]): Список, в который дописывается время каждого полухода в наносекундах
+            (выбор хода и его выполнение).
+
+    Возвращает:
+        GameSession: Сыгранная партия.
+    """
+    session = GameSession(rules)
+    for _ in range(max_plies):
+        started = perf_counter_ns()
+        moves = session.legal_moves()
+        if not moves:
+            break
+        session.play(*rng.choice(moves))
+        latencies.append(perf_counter_ns() - started)
+    return session
+
+
+def parse_scripted_move(rules: Rules, text: str, geometry) -> Optional[List[tuple]]:
+    """Разбирает записанный ход на вызовы `GameSession.play`.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        text (str): Запись хода: 'e2e4', 'a1-b3-c4' (двухшаговый ход) или 'c3xe5xg7' (шашки).
+        geometry (Geometry): Геометрия доски.
+
+    Возвращает:
+        Optional[List[tuple]]: Клетки для каждого вызова `play` (серия взятий — по одному
+            на взятие) или None, если запись некорректна.
+    """
+    squares = rules.parse_move(text, geometry)
+    return None if squares is None else rules.split_move(squares)
+
+
+def play_scripted_game(rules: Rules, moves: Sequence[str], latencies: List[int]) -> GameSession:
+    """Играет партию по записанным ходам ('e2e4' для шахмат, 'c3xe5xg7' для шашек).
+
+    Двухшаговый шахматный ход записывается тремя клетками через дефис: 'a1-b3-c4'.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        moves (Sequence[str]): Ходы партии.
+        latencies (List[int]): Список, в который дописывается время каждого хода в наносекундах.
+
+    Возвращает:
+        GameSession: Сыгранная партия.
+
+    Исключения:
+        ValueError: Ход записан некорректно или недопустим.
+    """
+    session = GameSession(rules)
+    geometry = session.board.geometry
+    for text in moves:
+        started = perf_counter_ns()
+        moves_played = parse_scripted_move(rules, text, geometry)
+        if moves_played is None:
+            raise ValueError(f"Некорректная запись хода: {text}")
+        for squares in moves_played:
+            if not session.play(*squares).ok:
+                raise ValueError(f"Недопустимый ход: {text}")
+        latencies.append(perf_counter_ns() - started)
+    return session
+
+
+def _percentile(values: List[int], fraction: float) -> float:
+    """Возвращает перцентиль отсортированного списка в микросекундах."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))] / 1e3
+
+
+def run(variant: str = 'chess', games: int = 20, seed: int = 0, max_plies: int = 200,
+        script: Optional[Iterable[Sequence[str]]] = None) -> Dict[str, float]:
+    """Играет серию партий и возвращает отчет.
+
+    Аргументы:
+        variant (str): 'chess', 'fairy' или 'checkers'.
+        games (int): Количество случайных партий (не используется, если задан `script`).
+        seed (int): Базовое значение генератора случайных чисел.
+        max_plies (int): Лимит полуходов в случайной партии.
+        script (Optional[Iterable[Sequence[str]]]): Записанные партии вместо случайных.
+
+    Возвращает:
+        Dict[str, float]: games/sec, moves/sec, p50/p99 времени полухода в микросекундах,
+            количество партий и ходов, контрольная сумма итоговых позиций.
+    """
+    rules = VARIANTS[variant]()
+    latencies: List[int] = []
+    checksum = 0
+    played = 0
+
+    started = perf_counter_ns()
+    if script is None:
+        for number in range(games):
+            session = play_random_game(rules, random.Random(seed * 1_000_003 + number), max_plies, latencies)
+            checksum = zlib.crc32(session.board.pack(), checksum)
+            played += 1
+    else:
+        for moves in script:
+            session = play_scripted_game(rules, moves, latencies)
+            checksum = zlib.crc32(session.board.pack(), checksum)
+            played += 1
+    elapsed = (perf_counter_ns() - started) / 1e9
+
+    latencies.sort()
+    return {
+        'variant': variant,
+        'games': played,
+        'moves': len(latencies),
+        'seconds': elapsed,
+        'games_per_sec': played / elapsed if elapsed else 0.0,
+        'moves_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_us': _percentile(latencies, 0.50),
+        'p99_us': _percentile(latencies, 0.99),
+        'checksum': checksum,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Разбирает аргументы командной строки и печатает отчет."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Замер скорости игры случайными или записанными партиями.")
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='chess')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-plies', type=int, default=200)
+    parser.add_argument('--script', help="Файл с партиями: одна партия в строке, ходы через пробел.")
+    parser.add_argument('--json', action='store_true', help="Печатать отчет в формате JSON.")
+    args = parser.parse_args(argv)
+
+    script = None
+    if args.script:
+        with open(args.script, encoding='utf-8') as file:
+            script = [line.split() for line in file if line.strip()]
+
+    report = run(args.variant, args.games, args.seed, args.max_plies, script)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['variant']}: {report['games']} партий, {report['moves']} ходов за {report['seconds']:.3f} с")
+    print(f"  партий/с: {report['games_per_sec']:.1f}   ходов/с: {report['moves_per_sec']:.0f}")
+    print(f"  полуход p50: {report['p50_us']:.1f} мкс   p99: {report['p99_us']:.1f} мкс")
+    print(f"  контрольная сумма: {report['checksum']:08x}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+"""Пул упакованных досок в разделяемой памяти для нескольких процессов.
+
+Каждая доска хранится в слоте блока `multiprocessing.shared_memory` в формате
+`Board.pack` (байт на клетку). Слот начинается заголовком:
+
+* занят ли слот (0 или 1);
+* тип доски (0 — `chess.Board`, 1 — `checkers.Board`);
+* размер доски;
+* сторона, которая ходит (0 — белые, 1 — черные);
+* счетчик версий (uint32): нечетный, пока идет запись.
+
+Любой процесс, подключенный к пулу, читает и изменяет доску прямо в общей
+памяти, поэтому передача партии другому процессу сводится к передаче номера
+слота. Запись и выделение слотов сериализуются общей блокировкой, а чтение
+идет без блокировки: читатель повторяет попытку, если версия слота изменилась
+во время чтения. Если слот долго остается в состоянии записи (например,
+процесс-писатель завершился посреди записи), читатель переходит к чтению
+под блокировкой и сообщает об ошибке, если блокировку получить не удалось.
+
+Пример:
+    pool = BoardPool(slots=128)
+    slot = pool.allocate(chess.Board())
+    Process(target=worker, args=(pool, slot)).start()   # в процессе: pool.load(slot)
+"""
+
+import multiprocessing
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Iterable, Optional, Tuple
+
+import checkers
+import chess
+
+_HEADER = struct.Struct('<BBBBI')
+_BOARD_TYPES = (chess.Board, checkers.Board)
+_COLORS = ('white', 'black')
+_READ_RETRIES = 1000
+
+
+class BoardPool:
+    """Набор слотов с упакованными досками в разделяемой памяти.
+
+    Объект пула можно передать в дочерний процесс (например, аргументом
+    `multiprocessing.Process`): дочерний процесс подключится к тому же блоку памяти
+    и к той же блокировке.
+
+    Атрибуты:
+        name (str): Имя блока разделяемой памяти.
+        slots (int): Количество слотов.
+        max_size (int): Наибольший размер доски, который помещается в слот.
+    """
+
+    def __init__(self, slots: int = 64, max_size: int = 10, name: Optional[str] = None, lock=None):
+        """Создает новый блок разделяемой памяти с пустыми слотами.
+
+        Аргументы:
+            slots (int): Количество слотов.
+            max_size (int): Наибольший размер доски.
+            name (Optional[str]): Имя блока; по умолчанию выбирается системой.
+            lock: Блокировка для записи; по умолчанию создается `multiprocessing.Lock`.
+
+        Исключения:
+            ValueError: Некорректное количество слотов или размер доски.
+        """
+        if slots <= 0 or not 0 < max_size <= 26:
+            raise ValueError(f"Некорректные параметры пула: {slots} слотов, доска до {max_size}x{max_size}")
+        self.slots = slots
+        self.max_size = max_size
+        self._slot_size = _HEADER.size + max_size * max_size
+        self._lock = lock or multiprocessing.Lock()
+        self._owner = os.getpid()
+        self._memory = shared_memory.SharedMemory(name=name, create=True, size=slots * self._slot_size)
+        self._memory.buf[:slots * self._slot_size] = bytes(slots * self._slot_size)
+        self.name = self._memory.name
+
+    def __getstate__(self):
+        return self.name, self.slots, self.max_size, self._lock
+
+    def __setstate__(self, state):
+        self.name, self.slots, self.max_size, self._lock = state
+        self._slot_size = _HEADER.size + self.max_size * self.max_size
+        self._owner = None
+        self._memory = shared_memory.SharedMemory(name=self.name)
+
+    def _offset(self, slot: int) -> int:
+        """Возвращает смещение заголовка слота.
+
+        Исключения:
+            IndexError: Номер слота вне пула.
+        """
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Слот {slot} вне пула из {self.slots} слотов")
+        return slot * self._slot_size
+
+    def _header(self, slot: int) -> Tuple[int, int, int, int, int]:
+        """Возвращает заголовок слота (занят, тип доски, размер, сторона, версия)."""
+        return _HEADER.unpack_from(self._memory.buf, self._offset(slot))
+
+    def _write(self, slot: int, board_type: int, size: int, turn: int, squares: Iterable[Tuple[int, int]]):
+        """Записывает байты клеток под блокировкой, увеличивая версию до и после записи.
+
+        Аргументы:
+            slot (int): Номер слота.
+            board_type (int): Тип доски.
+            size (int): Размер доски.
+            turn (int): Сторона, которая ходит.
+            squares (Iterable[Tuple[int, int]]): Пары (номер клетки, байт).
+        """
+        offset = self._offset(slot)
+        buf = self._memory.buf
+        version = _HEADER.unpack_from(buf, offset)[4]
+        _HEADER.pack_into(buf, offset, 1, board_type, size, turn, (version + 1) & 0xFFFFFFFF)
+        data = offset + _HEADER.size
+        for index, code in squares:
+            buf[data + index] = code
+        _HEADER.pack_into(buf, offset, 1, board_type, size, turn, (version + 2) & 0xFFFFFFFF)
+
+    def _encode(self, board) -> Tuple[int, bytes]:
+        """Возвращает тип доски и упакованную расстановку.
+
+        Исключения:
+            TypeError: Доска неизвестного типа.
+            ValueError: Доска не помещается в слот.
+        """
+        if type(board) not in _BOARD_TYPES:
+            raise TypeError(f"Неизвестный тип доски: {type(board).__name__}")
+        if board.size > self.max_size:
+            raise ValueError(f"Доска {board.size}x{board.size} не помещается в слот пула")
+        return _BOARD_TYPES.index(type(board)), board.pack()
+
+    def allocate(self, board, turn: str = 'white') -> int:
+        """Занимает свободный слот и записывает в него доску.
+
+        Аргументы:
+            board: Доска `chess.Board` или `checkers.Board`.
+            turn (str): Сторона, которая ходит.
+
+        Возвращает:
+            int: Номер слота.
+
+        Исключения:
+            MemoryError: Свободных слотов нет.
+        """
+        board_type, packed = self._encode(board)
+        with self._lock:
+            for slot in range(self.slots):
+                if not self._header(slot)[0]:
+                    self._write(slot, board_type, board.size, _COLORS.index(turn), enumerate(packed))
+                    return slot
+        raise MemoryError(f"В пуле нет свободных слотов ({self.slots})")
+
+    def free(self, slot: int):
+        """Освобождает слот.
+
+        Аргументы:
+            slot (int): Номер слота.
+        """
+        with self._lock:
+            offset = self._offset(slot)
+            version = self._header(slot)[4]
+            _HEADER.pack_into(self._memory.buf, offset, 0, 0, 0, 0, (version + 2) & 0xFFFFFFFF)
+
+    def store(self, slot: int, board, turn: Optional[str] = None):
+        """Перезаписывает доску в занятом слоте целиком.
+
+        Аргументы:
+            slot (int): Номер слота.
+            board: Доска `chess.Board` или `checkers.Board`.
+            turn (Optional[str]): Сторона, которая ходит; None — оставить записанную в слоте.
+
+        Исключения:
+            KeyError: Слот свободен.
+        """
+        board_type, packed = self._encode(board)
+        with self._lock:
+            used, _, _, stored_turn, _ = self._header(slot)
+            if not used:
+                raise KeyError(f"Слот {slot} свободен")
+            self._write(slot, board_type, board.size, self._turn(turn, stored_turn), enumerate(packed))
+
+    def update(self, slot: int, board, positions: Iterable[Tuple[int, int]], turn: Optional[str] = None):
+        """Записывает в слот только указанные клетки доски (например, `board.changed` после хода).
+
+        Аргументы:
+            slot (int): Номер слота.
+            board: Доска, из которой берутся клетки.
+            positions (Iterable[Tuple[int, int]]): Измененные клетки.
+            turn (Optional[str]): Сторона, которая ходит; None — оставить записанную в слоте.
+
+        Исключения:
+            KeyError: Слот свободен.
+            ValueError: Размер или тип доски не совпадает с записанной в слоте.
+        """
+        board_type, _ = self._encode(board)
+        size = board.size
+        squares = []
+        for row, col in positions:
+            piece = board.board[row][col]
+            squares.append((row * size + col, ord(str(piece)) if piece else 0))
+        with self._lock:
+            used, stored_type, stored_size, stored_turn, _ = self._header(slot)
+            if not used:
+                raise KeyError(f"Слот {slot} свободен")
+            if (stored_type, stored_size) != (board_type, size):
+                raise ValueError(f"Доска не совпадает с записанной в слоте {slot}")
+            self._write(slot, board_type, size, self._turn(turn, stored_turn), squares)
+
+    @staticmethod
+    def _turn(turn: Optional[str], stored: int) -> int:
+        """Возвращает код стороны для заголовка: `turn` или записанный в слоте, если `turn` равен None."""
+        return stored if turn is None else _COLORS.index(turn)
+
+    def view(self, slot: int) -> memoryview:
+        """Возвращает упакованную доску слота без копирования.
+
+        Содержимое может измениться, если другой процесс запишет слот; для
+        согласованного чтения используйте `load`. Представление нужно освободить
+        (`release`) до `close`.
+
+        Аргументы:
+            slot (int): Номер слота.
+
+        Возвращает:
+            memoryview: Байты клеток длиной size * size.
+
+        Исключения:
+            KeyError: Слот свободен.
+        """
+        used, _, size, _, _ = self._header(slot)
+        if not used:
+            raise KeyError(f"Слот {slot} свободен")
+        start = self._offset(slot) + _HEADER.size
+        return self._memory.buf[start:start + size * size]
+
+    def _read(self, slot: int):
+        """Читает заголовок и доску слота; возвращает (версия, доска, сторона)."""
+        used, board_type, size, turn, version = self._header(slot)
+        if not used:
+            raise KeyError(f"Слот {slot} свободен")
+        if version & 1:
+            return version, None, None
+        start = self._offset(slot) + _HEADER.size
+        with self._memory.buf[start:start + size * size] as data:
+            board = _BOARD_TYPES[board_type].unpack(data)
+        return version, board, _COLORS[turn]
+
+    def load(self, slot: int, timeout: float = 1.0):
+        """Читает доску из слота без блокировки.
+
+        Если согласованно прочитать слот не удалось за `_READ_RETRIES` попыток, доска
+        читается под блокировкой записи.
+
+        Аргументы:
+            slot (int): Номер слота.
+            timeout (float): Наибольшее время ожидания блокировки, секунды.
+
+        Возвращает:
+            tuple: (доска, сторона, которая ходит).
+
+        Исключения:
+            KeyError: Слот свободен.
+            TimeoutError: Блокировку не удалось получить (писатель завис или завершился,
+                не освободив ее).
+            RuntimeError: Запись в слот была прервана, содержимое слота не согласовано.
+        """
+        for _ in range(_READ_RETRIES):
+            version, board, turn = self._read(slot)
+            if board is not None and self._header(slot)[4] == version:
+                return board, turn
+            time.sleep(0)
+
+        if not self._lock.acquire(timeout=timeout):
+            raise TimeoutError(f"Слот {slot}: не удалось дождаться окончания записи")
+        try:
+            _, board, turn = self._read(slot)
+        finally:
+            self._lock.release()
+        if board is None:
+            raise RuntimeError(f"Слот {slot}: запись была прервана, содержимое не согласовано")
+        return board, turn
+
+    def version(self, slot: int) -> int:
+        """Возвращает счетчик версий слота; он меняется при каждой записи.
+
+        Аргументы:
+            slot (int): Номер слота.
+
+        Возвращает:
+            int: Версия слота.
+        """
+        return self._header(slot)[4]
+
+    def close(self):
+        """Отключается от блока памяти; процесс, создавший пул, также удаляет блок."""
+        if self._memory is None:
+            return
+        self._memory.close()
+        if self._owner == os.getpid():
+            self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
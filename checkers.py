@@ -1,4 +1,8 @@
-from typing import List, Optional, Tuple
+from math import isqrt
+from typing import Iterator, List, Optional, Tuple
+
+from geometry import JUMP_DIRECTIONS, get_geometry
+from render import render_board
 
 class Piece:
     """Базовый класс для шахматных фигур.
@@ -84,7 +88,7 @@ class Checker(Piece):
         start_row, start_col = start
         end_row, end_col = end
 
-        if not (0 <= end_row < 8 and 0 <= end_col < 8):
+        if end not in board.geometry.index:
             return False
 
         if board.get_piece(end) is not None:
@@ -129,21 +133,36 @@ class Board:
 
     Атрибуты:
         board (List[List[Optional[Piece]]]): Двумерный список, представляющий доску.
+        size (int): Размер доски (8 — русские шашки, 10 — международные).
+        geometry (Geometry): Предвычисленная геометрия доски этого размера.
+        changed (Set[Tuple[int, int]]): Клетки, измененные с последней отрисовки (см. `render.BoardRenderer`).
     """
 
-    def __init__(self):
-        """Инициализирует доску и расставляет шашки в начальные позиции."""
-        self.board = [[None for _ in range(8)] for _ in range(8)]
+    def __init__(self, size: int = 8):
+        """Инициализирует доску и расставляет шашки в начальные позиции.
+
+        Аргументы:
+            size (int): Размер доски.
+        """
+        self.size = size
+        self.geometry = get_geometry(size)
+        self.changed = set()
+        self.board = [[None for _ in range(size)] for _ in range(size)]
         self.setup_checkers()
 
     def setup_checkers(self):
-        """Расставляет шашки на доске в начальные позиции."""
-        for row in range(3):
-            for col in range(8):
+        """Расставляет шашки на доске в начальные позиции.
+
+        Каждая сторона занимает темные клетки своих (size - 2) // 2 горизонталей:
+        три на доске 8x8, четыре на доске 10x10.
+        """
+        filled_rows = (self.size - 2) // 2
+        for row in range(filled_rows):
+            for col in range(self.size):
                 if (row + col) % 2 == 1:
                     self.board[row][col] = Checker('black')
-        for row in range(5, 8):
-            for col in range(8):
+        for row in range(self.size - filled_rows, self.size):
+            for col in range(self.size):
                 if (row + col) % 2 == 1:
                     self.board[row][col] = Checker('white')
 
@@ -168,6 +187,7 @@ class Board:
         """
         row, col = position
         self.board[row][col] = piece
+        self.changed.add(position)
 
     def move_piece(self, start, end) -> bool:
         """Перемещает фигуру с начальной позиции на конечную.
@@ -186,19 +206,232 @@ class Board:
         if piece is None or not piece.can_move(self, start, end):
             return False
 
-        self.board[end[0]][end[1]] = piece
-        self.board[start[0]][start[1]] = None
+        for position, _ in self.make_move(start, end):
+            self.changed.add(position)
+        return True
+
+    def make_move(self, start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[Tuple[int, int], Optional[Piece]]]:
+        """Выполняет ход без проверки правил и возвращает запись для его отмены.
+
+        Перепрыгнутая шашка снимается с доски; шашка, дошедшая до последней горизонтали,
+        заменяется дамкой.
+
+        Аргументы:
+            start (Tuple[int, int]): Начальная позиция (строка, столбец).
+            end (Tuple[int, int]): Конечная позиция (строка, столбец).
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], Optional[Piece]]]: Пары (клетка, прежняя фигура) для `unmake_move`.
+        """
+        grid = self.board
+        piece = grid[start[0]][start[1]]
+        undo = [(start, piece), (end, grid[end[0]][end[1]])]
+        grid[end[0]][end[1]] = piece
+        grid[start[0]][start[1]] = None
 
         if isinstance(piece, Checker) and not piece.is_queen:
-            if (piece.color == 'white' and end[0] == 0) or (piece.color == 'black' and end[0] == 7):
-                piece.is_queen = True
+            if (piece.color == 'white' and end[0] == 0) or (piece.color == 'black' and end[0] == self.size - 1):
+                grid[end[0]][end[1]] = Checker(piece.color, is_queen=True)
 
         if abs(start[0] - end[0]) == 2:
             middle_row = (start[0] + end[0]) // 2
             middle_col = (start[1] + end[1]) // 2
-            self.board[middle_row][middle_col] = None
+            undo.append(((middle_row, middle_col), grid[middle_row][middle_col]))
+            grid[middle_row][middle_col] = None
 
-        return True
+        return undo
+
+    def unmake_move(self, undo: List[Tuple[Tuple[int, int], Optional[Piece]]]):
+        """Отменяет ход, выполненный `make_move`.
+
+        Аргументы:
+            undo (List[Tuple[Tuple[int, int], Optional[Piece]]]): Запись, возвращенная `make_move`.
+        """
+        grid = self.board
+        for (row, col), piece in reversed(undo):
+            grid[row][col] = piece
+
+    def captures_from(self, start: Tuple[int, int]) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Возвращает взятия, доступные шашке на клетке `start`.
+
+        Аргументы:
+            start (Tuple[int, int]): Позиция шашки (строка, столбец).
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (начальная позиция, конечная позиция).
+        """
+        grid = self.board
+        piece = grid[start[0]][start[1]]
+        if piece is None:
+            return []
+        captures = []
+        for (middle_row, middle_col), landing in self.geometry.jumps[start]:
+            middle = grid[middle_row][middle_col]
+            if middle is not None and middle.color != piece.color and piece.can_move(self, start, landing):
+                captures.append((start, landing))
+        return captures
+
+    def iter_captures(self, color: str) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Лениво перечисляет взятия шашек указанного цвета.
+
+        Аргументы:
+            color (str): Цвет шашек ('white' или 'black').
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (начальная позиция, конечная позиция).
+        """
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if piece and piece.color == color:
+                    yield from self.captures_from((row, col))
+
+    def iter_quiet_moves(self, color: str) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Лениво перечисляет ходы без взятия шашек указанного цвета.
+
+        Аргументы:
+            color (str): Цвет шашек ('white' или 'black').
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (начальная позиция, конечная позиция).
+        """
+        rays = self.geometry.rays
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if piece and piece.color == color:
+                    start = (row, col)
+                    for direction in JUMP_DIRECTIONS:
+                        for end in rays[start][direction]:
+                            if not piece.can_move(self, start, end):
+                                break
+                            yield start, end
+
+    def iter_moves(self, color: str) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Лениво перечисляет ходы указанного цвета: сначала взятия, затем тихие ходы.
+
+        Если есть хоть одно взятие, тихие ходы не перечисляются (взятие обязательно).
+        Доску нельзя изменять, пока перечисление не закончено.
+
+        Аргументы:
+            color (str): Цвет шашек ('white' или 'black').
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (начальная позиция, конечная позиция).
+        """
+        has_captures = False
+        for move in self.iter_captures(color):
+            has_captures = True
+            yield move
+        if not has_captures:
+            yield from self.iter_quiet_moves(color)
+
+    def has_capture(self, color: str) -> bool:
+        """Проверяет, есть ли у указанного цвета хотя бы одно взятие.
+
+        Перечисление останавливается на первом найденном взятии.
+
+        Аргументы:
+            color (str): Цвет шашек ('white' или 'black').
+
+        Возвращает:
+            bool: True, если взятие есть.
+        """
+        for _ in self.iter_captures(color):
+            return True
+        return False
+
+    def capture_moves(self, color: str) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Возвращает все взятия шашек указанного цвета.
+
+        Аргументы:
+            color (str): Цвет шашек ('white' или 'black').
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (начальная позиция, конечная позиция).
+        """
+        return list(self.iter_captures(color))
+
+    def _apply_chain(self, squares, color: str, undo_log: list) -> bool:
+        """Применяет один ход (простой или серию взятий), дописывая записи отмены в `undo_log`."""
+        squares = self.geometry.normalize(squares)
+        if squares is None or len(squares) < 2:
+            return False
+        start = squares[0]
+        piece = self.board[start[0]][start[1]]
+        if piece is None or piece.color != color:
+            return False
+
+        if not self.has_capture(color):
+            if len(squares) != 2 or not piece.can_move(self, start, squares[1]):
+                return False
+            undo_log.append(self.make_move(start, squares[1]))
+            return True
+
+        current = start
+        for landing in squares[1:]:
+            if (current, landing) not in self.captures_from(current):
+                return False
+            undo_log.append(self.make_move(current, landing))
+            current = landing
+        return not self.captures_from(current)
+
+    def apply_moves(self, sequence, color: str = 'white') -> Optional[int]:
+        """Проверяет и выполняет последовательность ходов за один вызов.
+
+        Каждый ход — последовательность клеток: (начало, конец) для простого хода или
+        (начало, клетка1, клетка2, ...) для серии взятий. Взятие обязательно, а серия
+        должна продолжаться, пока есть что брать. Цвета чередуются, начиная с `color`.
+        Если какой-то ход недопустим, доска возвращается в исходное состояние.
+
+        Аргументы:
+            sequence: Последовательность ходов.
+            color (str): Цвет, который делает первый ход.
+
+        Возвращает:
+            Optional[int]: Номер первого недопустимого хода или None, если все ходы выполнены.
+        """
+        undo_log = []
+        for number, squares in enumerate(sequence):
+            if not self._apply_chain(squares, color, undo_log):
+                for undo in reversed(undo_log):
+                    self.unmake_move(undo)
+                return number
+            color = 'black' if color == 'white' else 'white'
+
+        for undo in undo_log:
+            for position, _ in undo:
+                self.changed.add(position)
+        return None
+
+    def pack(self) -> bytes:
+        """Возвращает упакованную расстановку: по байту на клетку в порядке обхода по строкам.
+
+        Байт клетки — код символа шашки ('O'/'o', дамка 'K'/'k') или 0 для пустой клетки.
+
+        Возвращает:
+            bytes: Упакованная доска длиной size * size.
+        """
+        return bytes([ord(str(piece)) if piece else 0 for row in self.board for piece in row])
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'Board':
+        """Создает доску из результата `pack`.
+
+        Аргументы:
+            data (bytes): Упакованная доска.
+
+        Возвращает:
+            Board: Новая доска с той же расстановкой.
+        """
+        size = isqrt(len(data))
+        board = cls(size)
+        for i, code in enumerate(data):
+            piece = None
+            if code:
+                symbol = chr(code)
+                piece = Checker('white' if symbol.isupper() else 'black', is_queen=symbol.upper() == 'K')
+            board.board[i // size][i % size] = piece
+        board.changed.clear()
+        return board
 
     def __str__(self):
         """Возвращает строковое представление доски.
@@ -206,10 +439,4 @@ class Board:
         Возвращает:
             str: Строковое представление доски с координатами.
         """
-        result = []
-        result.append("  a b c d e f g h")
-        for i, row in enumerate(self.board):
-            row_str = ' '.join([str(piece) if piece else '.' for piece in row])
-            result.append(f"{8 - i} {row_str} {8 - i}")
-        result.append("  a b c d e f g h")
-        return '\n'.join(result)
\ No newline at end of file
+        return render_board(self)
@@ -1,12 +1,21 @@
-from typing import List, Optional, Tuple
+from math import isqrt
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from geometry import Geometry, get_geometry
+from movement import (BOTH, CAPTURE, DIAGONAL, KING, KNIGHT, MOVE, ORTHOGONAL, Anywhere, Leap, Movement,
+                      MoveTable, Slide)
+from render import render_board
 
 class Piece:
     """Базовый класс для шахматных фигур.
 
     Атрибуты:
         color (str): Цвет фигуры ('white' или 'black').
+        movement (Optional[Movement]): Декларативное описание перемещения фигуры.
     """
 
+    movement: Optional[Movement] = None
+
     def __init__(self, color: str):
         """Инициализирует фигуру с указанным цветом.
 
@@ -15,9 +24,29 @@ class Piece:
         """
         self.color = color
 
+    def get_move_table(self, geometry: Geometry) -> MoveTable:
+        """Возвращает скомпилированную таблицу ходов фигуры.
+
+        Аргументы:
+            geometry (Geometry): Геометрия доски.
+
+        Возвращает:
+            MoveTable: Таблица ходов для цвета фигуры и размера доски.
+
+        Исключения:
+            NotImplementedError: У подкласса нет описания перемещения.
+        """
+        if self.movement is None:
+            raise NotImplementedError("Метод должен быть реализован в подклассе")
+        return self.movement.table(self.color, geometry)
+
     def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
         """Проверяет, может ли фигура переместиться на указанную позицию.
 
+        Проверка выполняется по таблице, скомпилированной из атрибута `movement`. Для фигур
+        с двухшаговым ходом это проверка того, что клетка достижима за один ход (так
+        определяются шах и атаки); конкретный ход проверяет `is_move`.
+
         Аргументы:
             board (Board): Доска, на которой происходит игра.
             start (Tuple[int, int]): Начальная позиция фигуры (строка, столбец).
@@ -29,7 +58,74 @@ class Piece:
         Исключения:
             NotImplementedError: Метод должен быть реализован в подклассе.
         """
-        raise NotImplementedError("Метод должен быть реализован в подклассе")
+        return self.get_move_table(board.geometry).can_move(board, self.color, start, end)
+
+    def is_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int],
+                step: Optional[Tuple[int, int]] = None) -> bool:
+        """Проверяет ход по таблице.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            start (Tuple[int, int]): Начальная позиция фигуры (строка, столбец).
+            end (Tuple[int, int]): Конечная позиция (для двухшагового хода — клетка приземления).
+            step (Optional[Tuple[int, int]]): Клетка второго шага двухшагового хода.
+
+        Возвращает:
+            bool: True, если ход возможен, иначе False.
+        """
+        return self.get_move_table(board.geometry).is_move(board, self.color, start, end, step)
+
+    def get_moves(self, board: 'Board', start: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Возвращает все клетки, на которые фигура может переместиться.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            start (Tuple[int, int]): Позиция фигуры (строка, столбец).
+
+        Возвращает:
+            List[Tuple[int, int]]: Список целевых клеток.
+        """
+        return self.get_move_table(board.geometry).targets(board, self.color, start)
+
+    def iter_moves(self, board: 'Board', start: Tuple[int, int], captures: bool) -> Iterator[Tuple[int, int]]:
+        """Лениво перечисляет взятия или тихие ходы фигуры.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            start (Tuple[int, int]): Позиция фигуры (строка, столбец).
+            captures (bool): True — только взятия, False — только ходы на пустые клетки.
+
+        Возвращает:
+            Iterator[Tuple[int, int]]: Целевые клетки.
+        """
+        return self.get_move_table(board.geometry).iter_targets(board, self.color, start, captures)
+
+    def iter_steps(self, board: 'Board', start: Tuple[int, int],
+                   captures: bool) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Лениво перечисляет двухшаговые ходы фигуры (со взятием или без).
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            start (Tuple[int, int]): Позиция фигуры (строка, столбец).
+            captures (bool): True — только ходы со взятием, False — только ходы по пустым клеткам.
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]: Пары (клетка приземления, клетка второго шага).
+        """
+        table = self.get_move_table(board.geometry)
+        return table.iter_steps(board, self.color, start, captures) if table.two_step else iter(())
+
+    def attacks(self, board: 'Board', start: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+        """Перечисляет клетки, которые бьет фигура (включая защищаемые свои фигуры).
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            start (Tuple[int, int]): Позиция фигуры (строка, столбец).
+
+        Возвращает:
+            Iterator[Tuple[int, int]]: Битые клетки.
+        """
+        return self.get_move_table(board.geometry).attacks(board, self.color, start)
 
     def __str__(self):
         """Возвращает строковое представление фигуры.
@@ -55,30 +151,11 @@ class Piece:
 class Pawn(Piece):
     """Класс, представляющий пешку."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли пешка переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция пешки (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция пешки (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        direction = -1 if self.color == 'white' else 1
-        start_row, start_col = start
-        end_row, end_col = end
-
-        if start_col == end_col and end_row == start_row + direction:
-            return board.get_piece(end) is None
-        if start_col == end_col and end_row == start_row + 2 * direction:
-            if (self.color == 'white' and start_row == 6) or (self.color == 'black' and start_row == 1):
-                return board.get_piece(end) is None and board.get_piece((start_row + direction, start_col)) is None
-        if abs(end_col - start_col) == 1 and end_row == start_row + direction:
-            target_piece = board.get_piece(end)
-            return target_piece is not None and target_piece.color != self.color
-        return False
+    movement = Movement(
+        Leap([(1, 0)], MOVE, relative=True),
+        Slide([(1, 0)], MOVE, max_steps=2, relative=True, initial_only=True),
+        Leap([(1, -1), (1, 1)], CAPTURE, relative=True),
+    )
 
     def get_symbol(self) -> str:
         """Возвращает символ пешки.
@@ -92,34 +169,7 @@ class Pawn(Piece):
 class Rook(Piece):
     """Класс, представляющий ладью."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли ладья переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция ладьи (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция ладьи (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-
-        if start_row != end_row and start_col != end_col:
-            return False
-
-        if start_row == end_row:
-            step = 1 if end_col > start_col else -1
-            for col in range(start_col + step, end_col, step):
-                if board.get_piece((start_row, col)) is not None:
-                    return False
-        else:
-            step = 1 if end_row > start_row else -1
-            for row in range(start_row + step, end_row, step):
-                if board.get_piece((row, start_col)) is not None:
-                    return False
-        return True
+    movement = Movement(Slide(ORTHOGONAL))
 
     def get_symbol(self) -> str:
         """Возвращает символ ладьи.
@@ -133,20 +183,7 @@ class Rook(Piece):
 class Knight(Piece):
     """Класс, представляющий коня."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли конь переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция коня (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция коня (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-        return abs(start_row - end_row) * abs(start_col - end_col) == 2
+    movement = Movement(Leap(KNIGHT))
 
     def get_symbol(self) -> str:
         """Возвращает символ коня.
@@ -160,32 +197,7 @@ class Knight(Piece):
 class Bishop(Piece):
     """Класс, представляющий слона."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли слон переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция слона (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция слона (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-
-        if abs(start_row - end_row) != abs(start_col - end_col):
-            return False
-
-        step_row = 1 if end_row > start_row else -1
-        step_col = 1 if end_col > start_col else -1
-        row, col = start_row + step_row, start_col + step_col
-        while row != end_row and col != end_col:
-            if board.get_piece((row, col)) is not None:
-                return False
-            row += step_row
-            col += step_col
-        return True
+    movement = Movement(Slide(DIAGONAL))
 
     def get_symbol(self) -> str:
         """Возвращает символ слона.
@@ -199,18 +211,7 @@ class Bishop(Piece):
 class Queen(Piece):
     """Класс, представляющий ферзя."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли ферзь переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция ферзя (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция ферзя (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        return Rook(self.color).can_move(board, start, end) or Bishop(self.color).can_move(board, start, end)
+    movement = Movement(Slide(ORTHOGONAL + DIAGONAL))
 
     def get_symbol(self) -> str:
         """Возвращает символ ферзя.
@@ -224,20 +225,7 @@ class Queen(Piece):
 class King(Piece):
     """Класс, представляющий короля."""
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли король переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция короля (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция короля (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-        return abs(start_row - end_row) <= 1 and abs(start_col - end_col) <= 1
+    movement = Movement(Leap(KING))
 
     def get_symbol(self) -> str:
         """Возвращает символ короля.
@@ -249,38 +237,12 @@ class King(Piece):
 
 
 class Dragon(Piece):
-    """Класс, представляющий дракона (нестандартная фигура)."""
+    """Класс, представляющий дракона (нестандартная фигура).
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли дракон переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция дракона (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция дракона (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-
-        knight_move = abs(start_row - end_row) * abs(start_col - end_col) == 2
-        if knight_move:
-            return True
-
-        if abs(start_row - end_row) == abs(start_col - end_col):
-            step_row = 1 if end_row > start_row else -1
-            step_col = 1 if end_col > start_col else -1
-            row, col = start_row + step_row, start_col + step_col
-            while row != end_row and col != end_col:
-                if board.get_piece((row, col)) is not None:
-                    return False
-                row += step_row
-                col += step_col
-            return True
+    Дракон ходит как конь или как слон.
+    """
 
-        return False
+    movement = Movement(Leap(KNIGHT), Slide(DIAGONAL))
 
     def get_symbol(self) -> str:
         """Возвращает символ дракона.
@@ -299,31 +261,7 @@ class Tank(Piece):
     и перемещается на клетку, где стояла съеденная фигура.
     """
 
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """Проверяет, может ли танк переместиться на указанную позицию.
-
-        Аргументы:
-            board (Board): Доска, на которой происходит игра.
-            start (Tuple[int, int]): Начальная позиция танка (строка, столбец).
-            end (Tuple[int, int]): Конечная позиция танка (строка, столбец).
-
-        Возвращает:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-
-        target_piece = board.get_piece(end)
-        if target_piece is not None and target_piece.color != self.color:
-            return True
-
-        if start_col != end_col:
-            return False
-         
-        if abs(start_row - end_row) != 1:
-            return False
-
-        return board.get_piece(end) is None
+    movement = Movement(Leap([(1, 0), (-1, 0)], MOVE), Anywhere(CAPTURE))
 
     def get_symbol(self) -> str:
         """Возвращает символ танка.
@@ -338,45 +276,12 @@ class DancingKnight(Piece):
     """
     Класс, представляющий фигуру "Танцующий рыцарь".
 
-    Танцующий рыцарь двигается сначала как конь, а затем, если это возможно, делает дополнительный шаг на одну клетку влево по диагонали.
+    Танцующий рыцарь двигается сначала как конь, а затем делает обязательный шаг на одну клетку как король.
+    Клетку второго шага выбирает игрок, поэтому ход задается тремя клетками: (начало, клетка приземления,
+    клетка второго шага). Фигура берет фигуры противника и на клетке приземления, и на клетке второго шага.
     """
-    
-    def can_move(self, board: 'Board', start: Tuple[int, int], end: Tuple[int, int]) -> bool:
-        """
-        Проверяет, может ли фигура переместиться из начальной позиции в конечную.
-
-        Сначала выполняется ход конем (L-образное движение), затем проверяется возможность 
-        дополнительного хода на одну клетку влево по диагонали.
 
-        Args:
-            board (Board): Игровая доска.
-            start (Tuple[int, int]): Координаты начальной позиции (строка, колонка).
-            end (Tuple[int, int]): Координаты конечной позиции (строка, колонка).
-
-        Returns:
-            bool: True, если ход возможен, иначе False.
-        """
-        start_row, start_col = start
-        end_row, end_col = end
-
-        if (abs(start_row - end_row), abs(start_col - end_col)) not in [(2, 1), (1, 2)]:
-            return False
-
-        target_piece = board.get_piece(end)
-        if target_piece is not None and target_piece.color == self.color:
-            return False
-
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue  
-                new_row, new_col = end_row + dr, end_col + dc
-                if 0 <= new_row < 8 and 0 <= new_col < 8:
-                    target_piece = board.get_piece((new_row, new_col))
-                    if target_piece is None or target_piece.color != self.color:
-                        return True  
-
-        return False 
+    movement = Movement(Leap(KNIGHT, BOTH, then=Leap(KING)))
     
     def get_symbol(self) -> str:
         """
@@ -387,52 +292,62 @@ class DancingKnight(Piece):
         """
         return 'H'
 
+PIECE_CLASSES = (Pawn, Rook, Knight, Bishop, Queen, King, Dragon, Tank, DancingKnight)
+PIECES_BY_SYMBOL = {piece_class('white').get_symbol(): piece_class for piece_class in PIECE_CLASSES}
+
+
 class Board:
     """Класс, представляющий шахматную доску.
 
     Атрибуты:
         board (List[List[Optional[Piece]]]): Двумерный список, представляющий доску.
+        size (int): Размер доски (количество строк и столбцов).
+        geometry (Geometry): Предвычисленная геометрия доски этого размера.
+        changed (Set[Tuple[int, int]]): Клетки, измененные с последней отрисовки (см. `render.BoardRenderer`).
     """
 
-    def __init__(self, custom_setup: Optional[List[List[Optional[Piece]]]] = None):
+    def __init__(self, custom_setup: Optional[List[List[Optional[Piece]]]] = None, size: int = 8):
         """Инициализирует доску.
 
         Аргументы:
             custom_setup (Optional[List[List[Optional[Piece]]]]): Пользовательская расстановка фигур.
                 Если не указана, используется стандартная расстановка.
+            size (int): Размер доски. При пользовательской расстановке определяется по ней.
         """
-        self.board = [[None for _ in range(8)] for _ in range(8)]
+        if custom_setup:
+            size = len(custom_setup)
+        self.size = size
+        self.geometry = get_geometry(size)
+        self.changed = set()
+        self._kings = {}
+        self.board = [[None for _ in range(size)] for _ in range(size)]
         if custom_setup:
             self.board = custom_setup
         else:
             self.setup_default_board()
 
     def setup_default_board(self):
-        """Устанавливает стандартную расстановку фигур на доске."""
-        for col in range(8):
-            self.board[1][col] = Pawn('black')
-            self.board[6][col] = Pawn('white')
-
-        self.board[0][0] = Rook('black')
-        self.board[0][7] = Rook('black')
-        self.board[7][0] = Rook('white')
-        self.board[7][7] = Rook('white')
+        """Устанавливает стандартную расстановку фигур на доске.
 
-        self.board[0][1] = Knight('black')
-        self.board[0][6] = Knight('black')
-        self.board[7][1] = Knight('white')
-        self.board[7][6] = Knight('white')
+        На досках больше 8x8 ладьи, кони и слоны стоят по краям последней горизонтали,
+        ферзь и король — в ее центре.
 
-        self.board[0][2] = Bishop('black')
-        self.board[0][5] = Bishop('black')
-        self.board[7][2] = Bishop('white')
-        self.board[7][5] = Bishop('white')
+        Исключения:
+            ValueError: Доска меньше 8x8.
+        """
+        size = self.size
+        if size < 8:
+            raise ValueError(f"Стандартная расстановка невозможна на доске {size}x{size}")
 
-        self.board[0][3] = Queen('black')
-        self.board[7][3] = Queen('white')
+        for col in range(size):
+            self.board[1][col] = Pawn('black')
+            self.board[size - 2][col] = Pawn('white')
 
-        self.board[0][4] = King('black')
-        self.board[7][4] = King('white')
+        back_rank = {0: Rook, 1: Knight, 2: Bishop, size // 2 - 1: Queen, size // 2: King,
+                     size - 3: Bishop, size - 2: Knight, size - 1: Rook}
+        for col, piece_class in back_rank.items():
+            self.board[0][col] = piece_class('black')
+            self.board[size - 1][col] = piece_class('white')
 
     def get_piece(self, position) -> Optional[Piece]:
         """Возвращает фигуру на указанной позиции.
@@ -455,55 +370,96 @@ class Board:
         """
         row, col = position
         self.board[row][col] = piece
+        self.changed.add(position)
 
-    def move_piece(self, start: Tuple[int, int], end: Tuple[int, int]) -> bool:
+    def move_piece(self, start: Tuple[int, int], end: Tuple[int, int], step: Optional[Tuple[int, int]] = None) -> bool:
         """
         Перемещает фигуру с одной позиции на другую.
         
-        Если перемещаемая фигура — Танцующий рыцарь, он сначала двигается как конь,
-        а затем, если возможно, делает дополнительный ход как король.
+        Двухшаговый ход (Танцующий рыцарь) задается клеткой приземления `end` и клеткой
+        второго шага `step`.
+        Ход, после которого свой король оказывается под шахом, не выполняется.
         
         Args:
             start (Tuple[int, int]): Координаты начальной позиции (строка, колонка).
             end (Tuple[int, int]): Координаты конечной позиции (строка, колонка).
+            step (Optional[Tuple[int, int]]): Координаты клетки второго шага.
         
         Returns:
             bool: True, если ход выполнен успешно, иначе False.
         """
         piece = self.get_piece(start)
-        if piece is None or not piece.can_move(self, start, end):
+        if piece is None or not piece.is_move(self, start, end, step):
             return False
 
-        if isinstance(piece, DancingKnight):
-            self.board[end[0]][end[1]] = piece
-            self.board[start[0]][start[1]] = None
+        undo = self.make_move(start, end, step)
+        if self.is_check(piece.color):
+            self.unmake_move(undo)
+            return False
 
-            second_move_made = False
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    new_row, new_col = end[0] + dr, end[1] + dc
-                    if 0 <= new_row < 8 and 0 <= new_col < 8:
-                        target_piece = self.get_piece((new_row, new_col))
-                        if target_piece is None or target_piece.color != piece.color:
-                            self.board[new_row][new_col] = piece
-                            self.board[end[0]][end[1]] = None
-                            second_move_made = True
-                            break
-                if second_move_made:
-                    break
-
-            if not second_move_made:
-                self.board[start[0]][start[1]] = piece
-                self.board[end[0]][end[1]] = None
-                return False
+        for position, _ in undo:
+            self.changed.add(position)
+        return True
 
-        else:
-            self.board[end[0]][end[1]] = piece
-            self.board[start[0]][start[1]] = None
+    def make_move(self, start: Tuple[int, int], end: Tuple[int, int],
+                  step: Optional[Tuple[int, int]] = None) -> List[Tuple[Tuple[int, int], Optional[Piece]]]:
+        """Выполняет ход без проверки правил и возвращает запись для его отмены.
 
-        return True
+        Доска не копируется: запись хранит прежнее содержимое измененных клеток.
+        При двухшаговом ходе фигура затем переходит с клетки `end` на клетку `step`.
+
+        Аргументы:
+            start (Tuple[int, int]): Начальная позиция (строка, столбец).
+            end (Tuple[int, int]): Конечная позиция (строка, столбец).
+            step (Optional[Tuple[int, int]]): Клетка второго шага.
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], Optional[Piece]]]: Пары (клетка, прежняя фигура) для `unmake_move`.
+        """
+        grid = self.board
+        piece = grid[start[0]][start[1]]
+        undo = [(start, piece), (end, grid[end[0]][end[1]])]
+        grid[end[0]][end[1]] = piece
+        grid[start[0]][start[1]] = None
+        if step is not None:
+            undo.append((step, grid[step[0]][step[1]]))
+            grid[step[0]][step[1]] = piece
+            grid[end[0]][end[1]] = None
+        return undo
+
+    def unmake_move(self, undo: List[Tuple[Tuple[int, int], Optional[Piece]]]):
+        """Отменяет ход, выполненный `make_move`.
+
+        Аргументы:
+            undo (List[Tuple[Tuple[int, int], Optional[Piece]]]): Запись, возвращенная `make_move`.
+        """
+        grid = self.board
+        for (row, col), piece in reversed(undo):
+            grid[row][col] = piece
+
+    def find_king(self, color: str) -> Optional[Tuple[int, int]]:
+        """Возвращает позицию короля указанного цвета.
+
+        Последняя найденная позиция запоминается и проверяется первой.
+
+        Аргументы:
+            color (str): Цвет короля ('white' или 'black').
+
+        Возвращает:
+            Optional[Tuple[int, int]]: Позиция короля или None, если короля нет на доске.
+        """
+        cached = self._kings.get(color)
+        if cached is not None:
+            piece = self.board[cached[0]][cached[1]]
+            if isinstance(piece, King) and piece.color == color:
+                return cached
+
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if isinstance(piece, King) and piece.color == color:
+                    self._kings[color] = (row, col)
+                    return (row, col)
+        return None
 
     def is_check(self, color: str) -> bool:
         """Проверяет, находится ли король указанного цвета под шахом.
@@ -514,36 +470,372 @@ class Board:
         Возвращает:
             bool: True, если король под шахом, иначе False.
         """
-        king_position = None
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece((row, col))
-                if isinstance(piece, King) and piece.color == color:
-                    king_position = (row, col)
-                    break
-            if king_position:
-                break
-
+        king_position = self.find_king(color)
         if not king_position:
             return False
 
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece((row, col))
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
                 if piece and piece.color != color and piece.can_move(self, (row, col), king_position):
                     return True
         return False
 
+    def _king_threats(self, color: str, king_position: Tuple[int, int]):
+        """Собирает по таблицам ходов все, от чего зависит безопасность короля.
+
+        Возвращает:
+            tuple: (фигуры противника, шахи, связки, клетки второго шага):
+
+            * фигуры противника — тройки (позиция, фигура, таблица ходов);
+            * шахи — для каждой фигуры, объявившей шах, множество клеток, которые нужно
+              занять или освободить, чтобы его закрыть (клетка фигуры, промежуточные
+              клетки ее путей к королю, клетки приземления двухшаговых ходов);
+            * связки — для каждой клетки, стоящей на пути взятия короля, список пар
+              (клетки пути, занятые клетки пути); учитываются только пути, перекрытые
+              не больше чем двумя фигурами;
+            * клетки приземления двухшаговых ходов на короля: ход, затрагивающий их,
+              может открыть шах.
+        """
+        grid = self.board
+        geometry = self.geometry
+        attackers = []
+        checks = []
+        pins: Dict[Tuple[int, int], list] = {}
+        touch = set()
+        for row, line in enumerate(grid):
+            for col, piece in enumerate(line):
+                if piece is None or piece.color == color:
+                    continue
+                position = (row, col)
+                table = piece.get_move_table(geometry)
+                attackers.append((position, piece, table))
+                routes = table.routes[position].get(king_position)
+                middles = table.reach[position].get(king_position)
+                if routes is None and middles is None and table.anywhere is None:
+                    continue
+                if table.can_move(self, piece.color, position, king_position):
+                    closing = {position}
+                    for _, between, _ in routes or ():
+                        closing.update(between)
+                    for middle, _ in middles or ():
+                        closing.add(middle)
+                    checks.append(closing)
+                    continue
+                for mode, between, _ in routes or ():
+                    if mode == MOVE or not between:
+                        continue
+                    blockers = [square for square in between if grid[square[0]][square[1]] is not None]
+                    if len(blockers) <= 2:
+                        entry = (between, blockers)
+                        for square in blockers:
+                            pins.setdefault(square, []).append(entry)
+                for middle, _ in middles or ():
+                    touch.add(middle)
+        return attackers, checks, pins, touch
+
+    def _attacked(self, square: Tuple[int, int], attackers) -> bool:
+        """Проверяет по таблицам ходов, бьет ли клетку хотя бы одна из фигур `attackers`.
+
+        Фигуры, которых уже нет на своей клетке (взяты), пропускаются; для остальных
+        полная проверка выполняется, только если в таблице есть путь на клетку.
+        """
+        grid = self.board
+        for position, piece, table in attackers:
+            if grid[position[0]][position[1]] is not piece:
+                continue
+            if (table.anywhere is None and square not in table.routes[position]
+                    and square not in table.reach[position]):
+                continue
+            if table.can_move(self, piece.color, position, square):
+                return True
+        return False
+
+    def _safe_after(self, move: Tuple[Tuple[int, int], ...], king_position: Tuple[int, int], attackers) -> bool:
+        """Проверяет через make/unmake, что после хода клетка короля не под боем."""
+        undo = self.make_move(*move)
+        safe = not self._attacked(king_position, attackers)
+        self.unmake_move(undo)
+        return safe
+
+    @staticmethod
+    def _may_expose(move: Tuple[Tuple[int, int], ...], pins, touch) -> bool:
+        """Проверяет, может ли ход открыть линию на короля.
+
+        Ход освобождает начальную клетку (и клетку приземления двухшагового хода) и занимает
+        последнюю. Линия открывается, только если освобождаются все занятые клетки пути,
+        а последняя клетка хода лежит вне пути.
+        """
+        for square in move:
+            if square in touch:
+                return True
+        vacated = move[:-1]
+        final = move[-1]
+        for square in vacated:
+            for between, blockers in pins.get(square, ()):
+                if final not in between and all(blocker in vacated for blocker in blockers):
+                    return True
+        return False
+
+    def _leaves_king_safe(self, color: str, start: Tuple[int, int], end: Tuple[int, int],
+                          step: Optional[Tuple[int, int]] = None) -> bool:
+        """Проверяет ход через make/unmake: не остается ли свой король под шахом."""
+        undo = self.make_move(start, end, step)
+        safe = not self.is_check(color)
+        self.unmake_move(undo)
+        return safe
+
+    def is_legal_move(self, start: Tuple[int, int], end: Tuple[int, int],
+                      step: Optional[Tuple[int, int]] = None) -> bool:
+        """Проверяет, что ход допустим правилами фигуры и не оставляет своего короля под шахом.
+
+        Аргументы:
+            start (Tuple[int, int]): Начальная позиция (строка, столбец).
+            end (Tuple[int, int]): Конечная позиция (строка, столбец).
+            step (Optional[Tuple[int, int]]): Клетка второго шага двухшагового хода.
+
+        Возвращает:
+            bool: True, если ход допустим.
+        """
+        piece = self.get_piece(start)
+        if piece is None or not piece.is_move(self, start, end, step):
+            return False
+        return self._leaves_king_safe(piece.color, start, end, step)
+
+    def iter_moves(self, color: str) -> Iterator[Tuple[Tuple[int, int], ...]]:
+        """Лениво перечисляет ходы указанного цвета без учета шаха своему королю.
+
+        Сначала перечисляются все взятия, затем тихие ходы, поэтому вызывающий код может
+        остановиться на первом подходящем ходе, не строя список. Доску нельзя изменять,
+        пока перечисление не закончено.
+
+        Аргументы:
+            color (str): Цвет фигур ('white' или 'black').
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], ...]]: Пары (начальная позиция, конечная позиция);
+                двухшаговые ходы — тройки (начало, клетка приземления, клетка второго шага).
+        """
+        for captures in (True, False):
+            for row, line in enumerate(self.board):
+                for col, piece in enumerate(line):
+                    if piece is not None and piece.color == color:
+                        start = (row, col)
+                        for end in piece.iter_moves(self, start, captures):
+                            yield start, end
+                        for end, step in piece.iter_steps(self, start, captures):
+                            yield start, end, step
+
+    def iter_legal_moves(self, color: str) -> Iterator[Tuple[Tuple[int, int], ...]]:
+        """Лениво перечисляет ходы, не оставляющие своего короля под шахом (сначала взятия).
+
+        Ходы короля проверяются тем, бьет ли противник клетку назначения. Под шахом
+        рассматриваются только ходы, которые берут фигуру, объявившую шах, или занимают
+        клетки между ней и королем. Без шаха полностью проверяются только ходы фигур,
+        связанных единственным (или, для двухшагового хода, двумя) перекрытием линии;
+        остальные ходы заведомо допустимы. Доску нельзя изменять, пока перечисление не закончено.
+
+        Аргументы:
+            color (str): Цвет фигур ('white' или 'black').
+
+        Возвращает:
+            Iterator[Tuple[Tuple[int, int], ...]]: Ходы в формате `iter_moves`.
+        """
+        king_position = self.find_king(color)
+        if king_position is None:
+            yield from self.iter_moves(color)
+            return
+
+        attackers, checks, pins, touch = self._king_threats(color, king_position)
+        risky = touch.union(pins)
+        for move in self.iter_moves(color):
+            if move[0] == king_position:
+                if self._safe_after(move, move[-1], attackers):
+                    yield move
+            elif checks:
+                if (all(any(square in closing for square in move) for closing in checks)
+                        and self._safe_after(move, king_position, attackers)):
+                    yield move
+            elif (risky.isdisjoint(move) or not self._may_expose(move, pins, touch)
+                  or self._safe_after(move, king_position, attackers)):
+                yield move
+
+    def legal_moves(self, color: str) -> List[Tuple[Tuple[int, int], ...]]:
+        """Возвращает ходы указанного цвета, не оставляющие своего короля под шахом.
+
+        Аргументы:
+            color (str): Цвет фигур ('white' или 'black').
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], ...]]: Список пар (начальная позиция, конечная позиция)
+                и троек двухшаговых ходов, взятия идут первыми.
+        """
+        return list(self.iter_legal_moves(color))
+
+    def has_legal_move(self, color: str) -> bool:
+        """Проверяет, есть ли у указанного цвета хотя бы один допустимый ход.
+
+        Перечисление останавливается на первом найденном ходе.
+
+        Аргументы:
+            color (str): Цвет фигур ('white' или 'black').
+
+        Возвращает:
+            bool: True, если ход есть.
+        """
+        for _ in self.iter_legal_moves(color):
+            return True
+        return False
+
+    def is_checkmate(self, color: str) -> bool:
+        """Проверяет, получил ли король указанного цвета мат.
+
+        Аргументы:
+            color (str): Цвет короля ('white' или 'black').
+
+        Возвращает:
+            bool: True, если король под шахом и допустимых ходов нет.
+        """
+        return self.is_check(color) and not self.has_legal_move(color)
+
+    def apply_moves(self, sequence, color: str = 'white') -> Optional[int]:
+        """Проверяет и выполняет последовательность ходов за один вызов.
+
+        Каждый ход — пара (начальная позиция, конечная позиция) или тройка (начало, клетка
+        приземления, клетка второго шага) для двухшагового хода; цвета чередуются, начиная
+        с `color`. Шах противнику не проверяется, проверяется только, что свой король не
+        остается под шахом. Если какой-то ход недопустим, доска возвращается в исходное состояние.
+
+        Аргументы:
+            sequence: Последовательность ходов.
+            color (str): Цвет, который делает первый ход.
+
+        Возвращает:
+            Optional[int]: Номер первого недопустимого хода или None, если все ходы выполнены.
+        """
+        grid = self.board
+        normalize = self.geometry.normalize
+        undo_log = []
+        for number, move in enumerate(sequence):
+            legal = False
+            move = normalize(move)
+            if move is not None and len(move) in (2, 3):
+                start = move[0]
+                piece = grid[start[0]][start[1]]
+                if piece is not None and piece.color == color and piece.is_move(self, *move):
+                    undo_log.append(self.make_move(*move))
+                    legal = not self.is_check(color)
+            if not legal:
+                for undo in reversed(undo_log):
+                    self.unmake_move(undo)
+                return number
+            color = 'black' if color == 'white' else 'white'
+
+        for undo in undo_log:
+            for position, _ in undo:
+                self.changed.add(position)
+        return None
+
+    def generate_moves(self, color: str) -> List[Tuple[Tuple[int, int], ...]]:
+        """Возвращает все ходы фигур указанного цвета без учета шаха своему королю.
+
+        Аргументы:
+            color (str): Цвет фигур ('white' или 'black').
+
+        Возвращает:
+            List[Tuple[Tuple[int, int], ...]]: Список пар (начальная позиция, конечная позиция)
+                и троек двухшаговых ходов.
+        """
+        moves = []
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if piece is not None and piece.color == color:
+                    start = (row, col)
+                    for end in piece.get_moves(self, start):
+                        moves.append((start, end))
+                    for captures in (True, False):
+                        for end, step in piece.iter_steps(self, start, captures):
+                            moves.append((start, end, step))
+        return moves
+
+    def attack_map(self, color: str) -> List[List[int]]:
+        """Считает для каждой клетки, сколько фигур указанного цвета ее бьют.
+
+        Клетка бита фигурой, если та могла бы взять стоящую на ней фигуру противника
+        (по тем же таблицам, что и генерация ходов); клетки со своими фигурами
+        считаются защищенными. Танк бьет все клетки доски, кроме своей, а Танцующий
+        рыцарь — клетки приземления, после которых у него есть второй шаг, и клетки
+        второго шага.
+
+        Аргументы:
+            color (str): Цвет атакующих фигур ('white' или 'black').
+
+        Возвращает:
+            List[List[int]]: Количество атакующих фигур для каждой клетки, в той же
+                раскладке, что и `board`.
+        """
+        counts = [[0] * self.geometry.cols for _ in range(self.geometry.rows)]
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if piece is not None and piece.color == color:
+                    for end_row, end_col in piece.attacks(self, (row, col)):
+                        counts[end_row][end_col] += 1
+        return counts
+
+    def mobility(self, color: Optional[str] = None) -> Dict[Tuple[int, int], int]:
+        """Считает количество ходов каждой фигуры без учета шаха своему королю.
+
+        Двухшаговые ходы считаются по одному на каждую пару (клетка приземления, клетка второго шага).
+
+        Аргументы:
+            color (Optional[str]): Цвет фигур; по умолчанию считаются фигуры обоих цветов.
+
+        Возвращает:
+            Dict[Tuple[int, int], int]: Количество ходов для позиции каждой фигуры.
+        """
+        result = {}
+        for row, line in enumerate(self.board):
+            for col, piece in enumerate(line):
+                if piece is not None and (color is None or piece.color == color):
+                    start = (row, col)
+                    count = len(piece.get_moves(self, start))
+                    for captures in (True, False):
+                        count += sum(1 for _ in piece.iter_steps(self, start, captures))
+                    result[start] = count
+        return result
+
+    def pack(self) -> bytes:
+        """Возвращает упакованную расстановку: по байту на клетку в порядке обхода по строкам.
+
+        Байт клетки — код символа фигуры (заглавный для белых) или 0 для пустой клетки.
+
+        Возвращает:
+            bytes: Упакованная доска длиной size * size.
+        """
+        return bytes([ord(str(piece)) if piece else 0 for row in self.board for piece in row])
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'Board':
+        """Создает доску из результата `pack`.
+
+        Аргументы:
+            data (bytes): Упакованная доска.
+
+        Возвращает:
+            Board: Новая доска с той же расстановкой.
+        """
+        size = isqrt(len(data))
+        grid = [[None for _ in range(size)] for _ in range(size)]
+        for i, code in enumerate(data):
+            if code:
+                symbol = chr(code)
+                piece_class = PIECES_BY_SYMBOL[symbol.upper()]
+                grid[i // size][i % size] = piece_class('white' if symbol.isupper() else 'black')
+        return cls(custom_setup=grid)
+
     def __str__(self):
         """Возвращает строковое представление доски.
 
         Возвращает:
             str: Строковое представление доски с координатами.
         """
-        result = []
-        result.append("  a b c d e f g h")
-        for i, row in enumerate(self.board):
-            row_str = ' '.join([str(piece) if piece else '.' for piece in row])
-            result.append(f"{8 - i} {row_str} {8 - i}")
-        result.append("  a b c d e f g h")
-        return '\n'.join(result)
+        return render_board(self)
@@ -0,0 +1,105 @@
+"""Консольный интерфейс к игровой сессии.
+
+Общий цикл ввода ходов для всех вариантов игры: читает координаты,
+передает их в `GameSession` и печатает доску и сообщения.
+"""
+
+from typing import Optional, Tuple
+
+from notation import format_square, parse_square
+from render import BoardRenderer
+from session import CAPTURE_REQUIRED, INVALID, GameSession
+
+COMMON_TEXT = {
+    INVALID: 'Некорректные координаты. Попробуйте снова.',
+    CAPTURE_REQUIRED: 'Необходимо выполнить обязательное взятие.',
+}
+
+
+def interpretator(board, coord: str) -> Optional[Tuple[int, int]]:
+    """Преобразует координаты доски в индексы массива.
+
+    Аргументы:
+        board: Доска, для которой разбираются координаты.
+        coord (str): Координата на доске в формате 'a1', 'b2' и т.д.
+
+    Возвращает:
+        tuple: Кортеж с индексами (строка, столбец) или None, если координаты некорректны.
+    """
+    return parse_square(coord.strip(), board.geometry)
+
+
+def choose_required(session: GameSession, required) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Предлагает игроку выбрать один из обязательных ходов.
+
+    Аргументы:
+        session (GameSession): Текущая сессия.
+        required: Список обязательных ходов.
+
+    Возвращает:
+        Tuple[Tuple[int, int], Tuple[int, int]]: Выбранный ход.
+    """
+    geometry = session.board.geometry
+    print("У вас есть обязательные ходы (взятия):")
+    for i, (start, end) in enumerate(required):
+        print(f"{i + 1}. {format_square(start, geometry)} -> {format_square(end, geometry)}")
+
+    while True:
+        try:
+            choice = int(input("Выберите номер хода: ")) - 1
+            if 0 <= choice < len(required):
+                return required[choice]
+            print("Некорректный выбор. Попробуйте снова.")
+        except ValueError:
+            print("Введите число.")
+
+
+def run(session: GameSession, title: str):
+    """Запускает консольную партию.
+
+    Аргументы:
+        session (GameSession): Партия.
+        title (str): Заголовок перед начальной доской.
+    """
+    board = session.board
+    renderer = BoardRenderer(board)
+    text = dict(session.rules.texts, **COMMON_TEXT)
+    print(title)
+    print(renderer.render())
+
+    while True:
+        step_pos = None
+        if session.pending is None:
+            print(f"Сейчас ходят {'черные' if session.current_player == 'black' else 'белые'}.")
+            required = session.required_moves()
+            if required:
+                start_pos, end_pos = choose_required(session, required)
+            else:
+                start_pos = interpretator(board, input(text['start']))
+                end_pos = interpretator(board, input(text['end']))
+                if start_pos and end_pos and session.rules.requires_step(session, start_pos, end_pos):
+                    step_pos = interpretator(board, input(text['step']))
+                    if step_pos is None:
+                        print(text[INVALID])
+                        continue
+        else:
+            start_pos = session.pending
+            end_pos = interpretator(board, input('Введите координату для следующего взятия (например, a4): '))
+
+        result = session.play(start_pos, end_pos, step_pos)
+        if not result.ok:
+            print(text[result.status])
+            continue
+
+        if result.continues:
+            print("Возможно дальнейшее взятие.")
+            print(renderer.render())
+            continue
+
+        print("\nДоска после хода:")
+        print(renderer.render())
+
+        if result.check:
+            print(f"Король {'черных' if result.check == 'black' else 'белых'} под шахом!")
+
+        print(f'Количество ходов: {session.move_counter}')
@@ -0,0 +1,163 @@
+"""Геометрия доски произвольного размера.
+
+Для каждого размера доски один раз строятся индексы и имена клеток, лучи по
+восьми направлениям (первые клетки лучей — соседние клетки) и диагональные
+прыжки через клетку.
+Доски одного размера разделяют один объект `Geometry`.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import tablecache
+
+Position = Tuple[int, int]
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+JUMP_DIRECTIONS = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+FILES = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class Geometry:
+    """Предвычисленная геометрия прямоугольной доски.
+
+    Атрибуты:
+        rows (int): Количество строк.
+        cols (int): Количество столбцов.
+        squares (Tuple[Position, ...]): Все клетки в порядке обхода по строкам.
+        index (Dict[Position, int]): Номер клетки (строка * cols + столбец).
+        names (Dict[Position, str]): Имя клетки в шахматной нотации ('a1', 'j10').
+        by_name (Dict[str, Position]): Обратная таблица имен клеток.
+        rays (Dict[Position, Dict[Tuple[int, int], Tuple[Position, ...]]]): Лучи до края доски.
+        jumps (Dict[Position, Tuple[Tuple[Position, Position], ...]]): Диагональные прыжки
+            через клетку в виде пар (перепрыгиваемая клетка, клетка приземления).
+        header (str): Строка с буквенным обозначением столбцов.
+        rank_width (int): Ширина подписи номера строки.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        """Строит все таблицы для доски указанного размера.
+
+        Лучи и прыжки загружаются из дискового кэша (`tablecache`), если
+        они уже были построены в другом процессе.
+
+        Аргументы:
+            rows (int): Количество строк.
+            cols (int): Количество столбцов.
+
+        Исключения:
+            ValueError: Размер доски вне диапазона 1..26.
+        """
+        if not (0 < rows <= len(FILES) and 0 < cols <= len(FILES)):
+            raise ValueError(f"Неподдерживаемый размер доски: {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        self.squares = tuple((row, col) for row in range(rows) for col in range(cols))
+        self.index = {square: i for i, square in enumerate(self.squares)}
+        self.names = {(row, col): f"{FILES[col]}{rows - row}" for row, col in self.squares}
+        self.by_name = {name: square for square, name in self.names.items()}
+
+        cached = tablecache.load('geometry', f"{rows}x{cols}")
+        if cached is not None:
+            self.rays, self.jumps = cached
+        else:
+            self.rays = {}
+            for square in self.squares:
+                self.rays[square] = {direction: self._walk(square, direction) for direction in DIRECTIONS}
+            self.jumps = {square: tuple((self.rays[square][d][0], self.rays[square][d][1])
+                                        for d in JUMP_DIRECTIONS if len(self.rays[square][d]) >= 2)
+                          for square in self.squares}
+            tablecache.store('geometry', f"{rows}x{cols}", (self.rays, self.jumps))
+
+        self.rank_width = len(str(rows))
+        self.header = ' ' * (self.rank_width + 1) + ' '.join(FILES[:cols])
+
+    def _walk(self, start: Position, direction: Tuple[int, int], max_steps: Optional[int] = None):
+        """Возвращает клетки луча из `start` в направлении `direction` до края доски."""
+        d_row, d_col = direction
+        row, col = start[0] + d_row, start[1] + d_col
+        ray = []
+        while 0 <= row < self.rows and 0 <= col < self.cols:
+            if max_steps is not None and len(ray) >= max_steps:
+                break
+            ray.append((row, col))
+            row, col = row + d_row, col + d_col
+        return tuple(ray)
+
+    def contains(self, position: Position) -> bool:
+        """Проверяет, лежит ли позиция на доске.
+
+        Аргументы:
+            position (Position): Позиция (строка, столбец).
+
+        Возвращает:
+            bool: True, если клетка существует.
+        """
+        return position in self.index
+
+    def normalize(self, squares) -> Optional[Tuple[Position, ...]]:
+        """Приводит ход, записанный любыми последовательностями (например, списками из JSON), к кортежу клеток.
+
+        Аргументы:
+            squares: Последовательность клеток хода.
+
+        Возвращает:
+            Optional[Tuple[Position, ...]]: Кортеж клеток или None, если какой-то элемент
+                не является клеткой доски.
+        """
+        try:
+            move = tuple(tuple(square) for square in squares)
+            if all(square in self.index for square in move):
+                return move
+        except TypeError:
+            pass
+        return None
+
+    def ray(self, start: Position, direction: Tuple[int, int], max_steps: Optional[int] = None) -> Tuple[Position, ...]:
+        """Возвращает луч из клетки в заданном направлении.
+
+        Для восьми основных направлений используется готовая таблица.
+
+        Аргументы:
+            start (Position): Начальная клетка (не входит в луч).
+            direction (Tuple[int, int]): Шаг (строка, столбец).
+            max_steps (Optional[int]): Максимальная длина луча.
+
+        Возвращает:
+            Tuple[Position, ...]: Клетки луча по порядку удаления от `start`.
+        """
+        ray = self.rays[start].get(direction)
+        if ray is None:
+            return self._walk(start, direction, max_steps)
+        return ray if max_steps is None else ray[:max_steps]
+
+    def name(self, position: Position) -> str:
+        """Возвращает имя клетки в шахматной нотации.
+
+        Аргументы:
+            position (Position): Позиция (строка, столбец).
+
+        Возвращает:
+            str: Имя клетки, например 'e2'.
+        """
+        return self.names[position]
+
+
+_geometries: Dict[Tuple[int, int], Geometry] = {}
+
+
+def get_geometry(rows: int = 8, cols: Optional[int] = None) -> Geometry:
+    """Возвращает общую геометрию для доски указанного размера.
+
+    Аргументы:
+        rows (int): Количество строк.
+        cols (Optional[int]): Количество столбцов; по умолчанию равно `rows`.
+
+    Возвращает:
+        Geometry: Геометрия доски.
+    """
+    key = (rows, rows if cols is None else cols)
+    geometry = _geometries.get(key)
+    if geometry is None:
+        geometry = Geometry(*key)
+        _geometries[key] = geometry
+    return geometry
@@ -0,0 +1,567 @@
+"""Декларативное описание перемещений фигур.
+
+Фигура описывает свои ходы набором компонентов: прыжков (`Leap`), скольжений
+по лучам (`Slide`) и выстрела на любую клетку (`Anywhere`). Описание один раз
+компилируется в таблицы целей для каждой клетки доски (`MoveTable`), которые
+используются и для проверки хода, и для генерации ходов.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import tablecache
+from geometry import Geometry
+
+Position = Tuple[int, int]
+
+MOVE = 'move'
+CAPTURE = 'capture'
+BOTH = 'both'
+
+ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+KING = ORTHOGONAL + DIAGONAL
+KNIGHT = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+
+class Leap:
+    """Прыжок на фиксированные смещения без проверки промежуточных клеток.
+
+    Атрибуты:
+        offsets (Tuple[Tuple[int, int], ...]): Смещения (строка, столбец).
+        mode (str): MOVE — только тихий ход, CAPTURE — только взятие, BOTH — оба.
+        relative (bool): Смещение по строке задано «вперед» относительно цвета фигуры.
+        initial_only (bool): Прыжок разрешен только с начальной горизонтали.
+        then (Optional[Leap]): Обязательный второй шаг из клетки приземления: ход состоит
+            из трех клеток (начало, клетка приземления, клетка второго шага), второй шаг
+            делается на пустую клетку или со взятием.
+    """
+
+    def __init__(self, offsets: Sequence[Tuple[int, int]], mode: str = BOTH, relative: bool = False,
+                 initial_only: bool = False, then: Optional['Leap'] = None):
+        """Инициализирует прыжок.
+
+        Аргументы:
+            offsets (Sequence[Tuple[int, int]]): Смещения (строка, столбец).
+            mode (str): Режим хода (MOVE, CAPTURE или BOTH).
+            relative (bool): Считать смещение по строке относительно направления фигуры.
+            initial_only (bool): Разрешить прыжок только с начальной горизонтали.
+            then (Optional[Leap]): Обязательный второй шаг.
+        """
+        self.offsets = tuple(offsets)
+        self.mode = mode
+        self.relative = relative
+        self.initial_only = initial_only
+        self.then = then
+
+    def __repr__(self):
+        return (f"Leap({self.offsets!r}, {self.mode!r}, relative={self.relative!r}, "
+                f"initial_only={self.initial_only!r}, then={self.then!r})")
+
+
+class Slide:
+    """Скольжение по лучам до первой занятой клетки.
+
+    Атрибуты:
+        directions (Tuple[Tuple[int, int], ...]): Направления лучей (строка, столбец).
+        mode (str): MOVE, CAPTURE или BOTH.
+        max_steps (Optional[int]): Максимальная длина луча; None — до края доски.
+        relative (bool): Направление по строке задано «вперед» относительно цвета фигуры.
+        initial_only (bool): Скольжение разрешено только с начальной горизонтали.
+    """
+
+    def __init__(self, directions: Sequence[Tuple[int, int]], mode: str = BOTH, max_steps: Optional[int] = None,
+                 relative: bool = False, initial_only: bool = False):
+        """Инициализирует скольжение.
+
+        Аргументы:
+            directions (Sequence[Tuple[int, int]]): Направления лучей (строка, столбец).
+            mode (str): Режим хода (MOVE, CAPTURE или BOTH).
+            max_steps (Optional[int]): Максимальная длина луча.
+            relative (bool): Считать направление по строке относительно направления фигуры.
+            initial_only (bool): Разрешить скольжение только с начальной горизонтали.
+        """
+        self.directions = tuple(directions)
+        self.mode = mode
+        self.max_steps = max_steps
+        self.relative = relative
+        self.initial_only = initial_only
+
+    def __repr__(self):
+        return (f"Slide({self.directions!r}, {self.mode!r}, max_steps={self.max_steps!r}, "
+                f"relative={self.relative!r}, initial_only={self.initial_only!r})")
+
+
+class Anywhere:
+    """Ход на любую клетку доски независимо от расстояния (например, выстрел танка).
+
+    Атрибуты:
+        mode (str): MOVE, CAPTURE или BOTH.
+    """
+
+    def __init__(self, mode: str = CAPTURE):
+        """Инициализирует компонент.
+
+        Аргументы:
+            mode (str): Режим хода (MOVE, CAPTURE или BOTH).
+        """
+        self.mode = mode
+
+    def __repr__(self):
+        return f"Anywhere({self.mode!r})"
+
+
+class MoveTable:
+    """Скомпилированные таблицы ходов фигуры для одного цвета и размера доски.
+
+    Атрибуты:
+        leaps (Dict[Position, tuple]): Для каждой клетки — кортежи (цель, режим, клетки второго шага).
+        rays (Dict[Position, tuple]): Для каждой клетки — кортежи (луч, режим).
+        routes (Dict[Position, Dict[Position, tuple]]): Для пары клеток — варианты хода
+            (режим, клетки, которые должны быть пусты, клетки второго шага).
+        reach (Dict[Position, Dict[Position, tuple]]): Для двухшаговых прыжков — клетки,
+            достижимые вторым шагом, и кортежи (клетка приземления, режим первого шага).
+        anywhere (Optional[str]): Режим хода на любую клетку или None.
+        overlapping (bool): Могут ли разные компоненты давать одну и ту же цель.
+        two_step (bool): Есть ли у фигуры ходы со вторым шагом.
+    """
+
+    def __init__(self, leaps, rays, routes, reach, anywhere: Optional[str], overlapping: bool):
+        """Инициализирует таблицу готовыми данными (см. `Movement.table`)."""
+        self.leaps = leaps
+        self.rays = rays
+        self.routes = routes
+        self.reach = reach
+        self.anywhere = anywhere
+        self.overlapping = overlapping
+        self.two_step = any(reach.values())
+
+    @staticmethod
+    def _can_follow(grid, color: str, follow: Tuple[Position, ...]) -> bool:
+        """Проверяет, есть ли хотя бы одна свободная или вражеская клетка для второго шага."""
+        for row, col in follow:
+            piece = grid[row][col]
+            if piece is None or piece.color != color:
+                return True
+        return False
+
+    def can_move(self, board, color: str, start: Position, end: Position) -> bool:
+        """Проверяет, может ли фигура за один ход попасть на клетку `end` (пойти или взять).
+
+        Для двухшаговых прыжков учитываются и клетка приземления (если после нее есть
+        второй шаг), и клетки второго шага. Так проверяются шах и атаки; допустимость
+        конкретного хода проверяет `is_move`.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Начальная позиция (строка, столбец).
+            end (Position): Конечная позиция (строка, столбец).
+
+        Возвращает:
+            bool: True, если ход возможен, иначе False.
+        """
+        grid = board.board
+        target = grid[end[0]][end[1]]
+        if target is not None and target.color == color:
+            return False
+
+        for mode, between, follow in self.routes[start].get(end, ()):
+            if target is None:
+                if mode == CAPTURE:
+                    continue
+            elif mode == MOVE:
+                continue
+            blocked = False
+            for row, col in between:
+                if grid[row][col] is not None:
+                    blocked = True
+                    break
+            if blocked:
+                continue
+            if follow is not None and not self._can_follow(grid, color, follow):
+                continue
+            return True
+
+        for middle, mode in self.reach[start].get(end, ()):
+            piece = grid[middle[0]][middle[1]]
+            if piece is None:
+                if mode != CAPTURE:
+                    return True
+            elif mode != MOVE and piece.color != color:
+                return True
+
+        if self.anywhere is not None and start != end:
+            if target is None:
+                return self.anywhere != CAPTURE
+            return self.anywhere != MOVE
+        return False
+
+    def is_move(self, board, color: str, start: Position, end: Position, step: Optional[Position] = None) -> bool:
+        """Проверяет конкретный ход по таблице.
+
+        Ход двухшагового прыжка задается клеткой приземления `end` и клеткой второго
+        шага `step`; остальные ходы — без `step`.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Начальная позиция (строка, столбец).
+            end (Position): Конечная позиция или клетка приземления (строка, столбец).
+            step (Optional[Position]): Клетка второго шага.
+
+        Возвращает:
+            bool: True, если ход возможен, иначе False.
+        """
+        grid = board.board
+        target = grid[end[0]][end[1]]
+        if target is not None and target.color == color:
+            return False
+
+        for mode, between, follow in self.routes[start].get(end, ()):
+            if target is None:
+                if mode == CAPTURE:
+                    continue
+            elif mode == MOVE:
+                continue
+            if (follow is None) != (step is None):
+                continue
+            blocked = False
+            for row, col in between:
+                if grid[row][col] is not None:
+                    blocked = True
+                    break
+            if blocked:
+                continue
+            if follow is None:
+                return True
+            if step in follow:
+                piece = grid[step[0]][step[1]]
+                if piece is None or piece.color != color:
+                    return True
+
+        if step is None and self.anywhere is not None and start != end:
+            if target is None:
+                return self.anywhere != CAPTURE
+            return self.anywhere != MOVE
+        return False
+
+    def targets(self, board, color: str, start: Position) -> List[Position]:
+        """Возвращает все клетки, на которые фигура может пойти из `start` за один шаг.
+
+        Двухшаговые ходы перечисляет `iter_steps`.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Позиция фигуры (строка, столбец).
+
+        Возвращает:
+            List[Position]: Список целевых клеток.
+        """
+        grid = board.board
+        result = []
+
+        for end, mode, follow in self.leaps[start]:
+            if follow is not None:
+                continue
+            piece = grid[end[0]][end[1]]
+            if piece is None:
+                if mode == CAPTURE:
+                    continue
+            elif mode == MOVE or piece.color == color:
+                continue
+            result.append(end)
+
+        for ray, mode in self.rays[start]:
+            for end in ray:
+                piece = grid[end[0]][end[1]]
+                if piece is None:
+                    if mode != CAPTURE:
+                        result.append(end)
+                    continue
+                if mode != MOVE and piece.color != color:
+                    result.append(end)
+                break
+
+        if self.anywhere is not None:
+            for row, line in enumerate(grid):
+                for col, piece in enumerate(line):
+                    if piece is None:
+                        if self.anywhere != CAPTURE and (row, col) != start:
+                            result.append((row, col))
+                    elif self.anywhere != MOVE and piece.color != color:
+                        result.append((row, col))
+            return list(dict.fromkeys(result))
+
+        if self.overlapping:
+            return list(dict.fromkeys(result))
+        return result
+
+    def iter_targets(self, board, color: str, start: Position, captures: bool) -> Iterator[Position]:
+        """Лениво перечисляет цели одного типа: только взятия или только тихие ходы.
+
+        Двухшаговые ходы перечисляет `iter_steps`.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Позиция фигуры (строка, столбец).
+            captures (bool): True — клетки с фигурами противника, False — пустые клетки.
+
+        Возвращает:
+            Iterator[Position]: Целевые клетки.
+        """
+        grid = board.board
+        skip = CAPTURE if not captures else MOVE
+        seen = set() if self.overlapping or self.anywhere is not None else None
+
+        for end, mode, follow in self.leaps[start]:
+            if mode == skip or follow is not None:
+                continue
+            piece = grid[end[0]][end[1]]
+            if (piece is None) == captures or (piece is not None and piece.color == color):
+                continue
+            if seen is not None:
+                if end in seen:
+                    continue
+                seen.add(end)
+            yield end
+
+        for ray, mode in self.rays[start]:
+            for end in ray:
+                piece = grid[end[0]][end[1]]
+                if piece is None:
+                    if not captures and mode != CAPTURE and (seen is None or end not in seen):
+                        if seen is not None:
+                            seen.add(end)
+                        yield end
+                    continue
+                if captures and mode != MOVE and piece.color != color and (seen is None or end not in seen):
+                    if seen is not None:
+                        seen.add(end)
+                    yield end
+                break
+
+        if self.anywhere is not None and self.anywhere != skip:
+            for row, line in enumerate(grid):
+                for col, piece in enumerate(line):
+                    if (piece is None) == captures or (piece is not None and piece.color == color):
+                        continue
+                    end = (row, col)
+                    if end != start and end not in seen:
+                        seen.add(end)
+                        yield end
+
+    def iter_steps(self, board, color: str, start: Position, captures: bool) -> Iterator[Tuple[Position, Position]]:
+        """Лениво перечисляет двухшаговые ходы одного типа.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Позиция фигуры (строка, столбец).
+            captures (bool): True — ходы, берущие фигуру на клетке приземления или второго
+                шага, False — ходы по пустым клеткам.
+
+        Возвращает:
+            Iterator[Tuple[Position, Position]]: Пары (клетка приземления, клетка второго шага).
+        """
+        grid = board.board
+        for end, mode, follow in self.leaps[start]:
+            if follow is None:
+                continue
+            target = grid[end[0]][end[1]]
+            if target is None:
+                if mode == CAPTURE:
+                    continue
+            elif mode == MOVE or target.color == color:
+                continue
+            for step in follow:
+                piece = grid[step[0]][step[1]]
+                if piece is not None and piece.color == color:
+                    continue
+                if (target is not None or piece is not None) == captures:
+                    yield end, step
+
+    def attacks(self, board, color: str, start: Position) -> Iterator[Position]:
+        """Перечисляет клетки, которые бьет фигура.
+
+        Клетка считается битой, если фигура могла бы взять стоящую на ней фигуру
+        противника; клетки со своими фигурами при этом считаются защищенными и тоже
+        перечисляются. Ход на любую клетку бьет всю доску, а прыжок со вторым шагом
+        бьет клетку приземления, если после нее есть куда сделать второй шаг, и клетки
+        второго шага, если на клетку приземления можно встать.
+
+        Аргументы:
+            board (Board): Доска, на которой происходит игра.
+            color (str): Цвет фигуры.
+            start (Position): Позиция фигуры (строка, столбец).
+
+        Возвращает:
+            Iterator[Position]: Битые клетки без повторов.
+        """
+        if self.anywhere is not None and self.anywhere != MOVE:
+            for end in board.geometry.squares:
+                if end != start:
+                    yield end
+            return
+
+        grid = board.board
+        seen = set() if self.overlapping or self.two_step else None
+        for end, mode, follow in self.leaps[start]:
+            if mode == MOVE:
+                continue
+            if follow is not None and not self._can_follow(grid, color, follow):
+                continue
+            if seen is not None:
+                if end in seen:
+                    continue
+                seen.add(end)
+            yield end
+
+        for ray, mode in self.rays[start]:
+            if mode == MOVE:
+                continue
+            for end in ray:
+                if seen is None or end not in seen:
+                    if seen is not None:
+                        seen.add(end)
+                    yield end
+                if grid[end[0]][end[1]] is not None:
+                    break
+
+        for end, middles in self.reach[start].items():
+            if end in seen:
+                continue
+            for middle, mode in middles:
+                piece = grid[middle[0]][middle[1]]
+                if piece is None:
+                    if mode == CAPTURE:
+                        continue
+                elif mode == MOVE or piece.color == color:
+                    continue
+                seen.add(end)
+                yield end
+                break
+
+
+class Movement:
+    """Описание перемещения фигуры как набора компонентов.
+
+    Атрибуты:
+        components (Tuple): Компоненты `Leap`, `Slide` и `Anywhere`.
+    """
+
+    def __init__(self, *components):
+        """Инициализирует описание.
+
+        Аргументы:
+            *components: Компоненты `Leap`, `Slide` и `Anywhere`.
+        """
+        self.components = components
+        self._tables: Dict[Tuple[Optional[str], Geometry], MoveTable] = {}
+        self._by_color = any(getattr(part, 'relative', False) or getattr(part, 'initial_only', False)
+                             for component in components for part in (component, getattr(component, 'then', None)))
+
+    def __repr__(self):
+        return f"Movement({', '.join(map(repr, self.components))})"
+
+    def table(self, color: str, geometry: Geometry) -> MoveTable:
+        """Возвращает таблицу ходов, компилируя ее при первом обращении.
+
+        Если ходы фигуры не зависят от направления (нет относительных и начальных
+        компонентов), обе стороны используют одну таблицу. Скомпилированные таблицы
+        сохраняются в дисковый кэш (`tablecache`), и в следующих процессах загружаются
+        из него без компиляции.
+
+        Аргументы:
+            color (str): Цвет фигуры ('white' или 'black').
+            geometry (Geometry): Геометрия доски.
+
+        Возвращает:
+            MoveTable: Скомпилированная таблица.
+        """
+        key = (color if self._by_color else None, geometry)
+        table = self._tables.get(key)
+        if table is None:
+            cache_key = f"{self!r}|{key[0]}|{geometry.rows}x{geometry.cols}"
+            data = tablecache.load('moves', cache_key)
+            if data is None:
+                table = self._compile(color, geometry)
+                tablecache.store('moves', cache_key, (table.leaps, table.rays, table.routes, table.reach,
+                                                      table.anywhere, table.overlapping))
+            else:
+                table = MoveTable(*data)
+            self._tables[key] = table
+        return table
+
+    def _compile(self, color: str, geometry: Geometry) -> MoveTable:
+        """Строит таблицы целей для каждой клетки доски."""
+        forward = -1 if color == 'white' else 1
+        initial_row = geometry.rows - 2 if color == 'white' else 1
+        anywhere = None
+        leaps, rays, routes, reach = {}, {}, {}, {}
+        overlapping = False
+
+        def orient(offset, relative):
+            return (offset[0] * forward, offset[1]) if relative else offset
+
+        def leap_targets(start, leap):
+            result = []
+            for offset in leap.offsets:
+                d_row, d_col = orient(offset, leap.relative)
+                end = (start[0] + d_row, start[1] + d_col)
+                if end in geometry.index:
+                    result.append(end)
+            return result
+
+        for component in self.components:
+            if isinstance(component, Anywhere):
+                anywhere = component.mode
+
+        for start in geometry.squares:
+            square_leaps = []
+            square_rays: Dict[Tuple[Tuple[int, int], str], Tuple[Position, ...]] = {}
+            square_routes: Dict[Position, list] = {}
+            square_reach: Dict[Position, list] = {}
+
+            for component in self.components:
+                if isinstance(component, Anywhere):
+                    continue
+                if component.initial_only and start[0] != initial_row:
+                    continue
+                if isinstance(component, Leap):
+                    for end in leap_targets(start, component):
+                        follow = None
+                        if component.then is not None:
+                            follow = tuple(leap_targets(end, component.then))
+                            for step in follow:
+                                square_reach.setdefault(step, []).append((end, component.mode))
+                        square_leaps.append((end, component.mode, follow))
+                        square_routes.setdefault(end, []).append((component.mode, (), follow))
+                else:
+                    for direction in component.directions:
+                        direction = orient(direction, component.relative)
+                        ray = geometry.ray(start, direction, component.max_steps)
+                        key = (direction, component.mode)
+                        if len(ray) > len(square_rays.get(key, ())):
+                            square_rays[key] = ray
+
+            for (_, mode), ray in square_rays.items():
+                for i, end in enumerate(ray):
+                    square_routes.setdefault(end, []).append((mode, ray[:i], None))
+
+            seen = set()
+            for end, _, _ in square_leaps:
+                overlapping = overlapping or end in seen
+                seen.add(end)
+            for ray in square_rays.values():
+                for end in ray:
+                    overlapping = overlapping or end in seen
+                    seen.add(end)
+
+            leaps[start] = tuple(square_leaps)
+            rays[start] = tuple((ray, mode) for (_, mode), ray in square_rays.items() if ray)
+            routes[start] = {end: tuple(options) for end, options in square_routes.items()}
+            reach[start] = {end: tuple(middles) for end, middles in square_reach.items()}
+
+        return MoveTable(leaps, rays, routes, reach, anywhere, overlapping)
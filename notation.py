@@ -0,0 +1,152 @@
+"""Разбор и запись координат и ходов.
+
+Поддерживаются имена клеток ('e2', 'j10'), ходы в длинной алгебраической
+нотации ('e2e4', с превращением — 'e7e8q') и серии взятий в шашках
+('c3xe5xg7'; простой ход — 'c3-d4'). Для каждой геометрии доски один раз
+строятся таблицы всех имен клеток и всех ходов, поэтому разбор сводится к
+поиску в словаре и не создает новых объектов для корректного ввода.
+Некорректный ввод дает None, а не исключение.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+from geometry import Geometry, get_geometry
+
+Position = Tuple[int, int]
+Move = Tuple[Position, Position, Optional[str]]
+
+MAX_MOVE_TABLE_SQUARES = 100
+PROMOTIONS = 'qrbn'
+
+_moves: Dict[Geometry, Dict[str, Move]] = {}
+
+
+def _move_table(geometry: Geometry) -> Optional[Dict[str, Move]]:
+    """Возвращает таблицу всех ходов 'e2e4' для геометрии или None для слишком больших досок."""
+    table = _moves.get(geometry)
+    if table is None:
+        if len(geometry.squares) > MAX_MOVE_TABLE_SQUARES:
+            return None
+        names = geometry.names
+        table = {names[start] + names[end]: (start, end, None)
+                 for start in geometry.squares for end in geometry.squares if start != end}
+        _moves[geometry] = table
+    return table
+
+
+def parse_square(text: str, geometry: Optional[Geometry] = None) -> Optional[Position]:
+    """Преобразует имя клетки в индексы.
+
+    Аргументы:
+        text (str): Имя клетки, например 'e2'.
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        Optional[Position]: Позиция (строка, столбец) или None, если имя некорректно.
+    """
+    return (geometry or get_geometry()).by_name.get(text)
+
+
+def format_square(position: Position, geometry: Optional[Geometry] = None) -> str:
+    """Возвращает имя клетки.
+
+    Аргументы:
+        position (Position): Позиция (строка, столбец).
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        str: Имя клетки, например 'e2'.
+    """
+    return (geometry or get_geometry()).names[position]
+
+
+def _split_move(text: str, geometry: Geometry) -> Optional[Tuple[Position, Position]]:
+    """Разбирает ход из двух имен клеток без таблицы ходов (для больших досок)."""
+    by_name = geometry.by_name
+    for i in range(2, len(text) - 1):
+        if text[i].isalpha():
+            start, end = by_name.get(text[:i]), by_name.get(text[i:])
+            if start is not None and end is not None and start != end:
+                return start, end
+            return None
+    return None
+
+
+def parse_move(text: str, geometry: Optional[Geometry] = None) -> Optional[Move]:
+    """Разбирает ход в длинной алгебраической нотации.
+
+    Аргументы:
+        text (str): Ход, например 'e2e4' или 'e7e8q'.
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        Optional[Move]: Кортеж (начало, конец, символ превращения из `PROMOTIONS` или None)
+            либо None, если запись некорректна.
+    """
+    geometry = geometry or get_geometry()
+    table = _move_table(geometry)
+    if table is not None:
+        move = table.get(text)
+        if move is not None or len(text) < 5 or text[-1] not in PROMOTIONS:
+            return move
+        move = table.get(text[:-1])
+        return None if move is None else (move[0], move[1], text[-1])
+
+    promotion = None
+    if len(text) > 4 and text[-1].isalpha() and text[-2].isdigit():
+        if text[-1] not in PROMOTIONS:
+            return None
+        text, promotion = text[:-1], text[-1]
+    squares = _split_move(text, geometry)
+    return None if squares is None else (squares[0], squares[1], promotion)
+
+
+def format_move(start: Position, end: Position, promotion: Optional[str] = None,
+                geometry: Optional[Geometry] = None) -> str:
+    """Записывает ход в длинной алгебраической нотации.
+
+    Аргументы:
+        start (Position): Начальная позиция.
+        end (Position): Конечная позиция.
+        promotion (Optional[str]): Символ фигуры превращения.
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        str: Запись хода, например 'e2e4'.
+    """
+    names = (geometry or get_geometry()).names
+    text = names[start] + names[end]
+    return text + promotion if promotion else text
+
+
+def parse_chain(text: str, geometry: Optional[Geometry] = None) -> Optional[Tuple[Position, ...]]:
+    """Разбирает шашечный ход: серию взятий 'c3xe5xg7' или простой ход 'c3-d4'.
+
+    Аргументы:
+        text (str): Запись хода.
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        Optional[Tuple[Position, ...]]: Клетки хода по порядку или None, если запись некорректна.
+    """
+    by_name = (geometry or get_geometry()).by_name
+    parts = text.split('x') if 'x' in text else text.split('-')
+    if len(parts) < 2:
+        return None
+    squares = tuple(by_name.get(part) for part in parts)
+    return None if None in squares else squares
+
+
+def format_chain(squares: Sequence[Position], capture: bool = True, geometry: Optional[Geometry] = None) -> str:
+    """Записывает шашечный ход.
+
+    Аргументы:
+        squares (Sequence[Position]): Клетки хода по порядку.
+        capture (bool): True — серия взятий ('c3xe5'), False — простой ход ('c3-d4').
+        geometry (Optional[Geometry]): Геометрия доски; по умолчанию 8x8.
+
+    Возвращает:
+        str: Запись хода.
+    """
+    names = (geometry or get_geometry()).names
+    return ('x' if capture else '-').join([names[square] for square in squares])
@@ -0,0 +1,263 @@
+"""Сохранение партий в журнал ходов и восстановление после сбоя.
+
+Журнал — двоичный файл, в который только дописываются записи:
+
+* заголовок ``PRPGLOG1``;
+* ход: ``b'M'``, цвет (0 — белые, 1 — черные), строка и столбец начала, строка и столбец конца;
+* двухшаговый ход: ``b'S'``, те же поля и строка и столбец клетки второго шага;
+* контрольная точка: ``b'C'``, цвет стороны, которая ходит, счетчик ходов (uint32),
+  размер доски, клетка незавершенной серии взятий (0xFF, если ее нет) и упакованная
+  доска (`Board.pack`).
+
+Партия восстанавливается из последней контрольной точки, после которой
+переигрываются только записанные за ней ходы. Неполная запись в конце файла
+(процесс упал во время записи) игнорируется.
+"""
+
+import os
+import struct
+from typing import BinaryIO, List, Optional, Tuple
+
+from session import GameSession, Rules
+
+MAGIC = b'PRPGLOG1'
+MOVE = b'M'
+STEP_MOVE = b'S'
+CHECKPOINT = b'C'
+
+ALWAYS = 'always'
+BATCH = 'batch'
+NEVER = 'never'
+
+_MOVE = struct.Struct('<BBBBB')
+_STEP_MOVE = struct.Struct('<BBBBBBB')
+_CHECKPOINT = struct.Struct('<BIBBB')
+_NO_SQUARE = 0xFF
+_COLORS = ('white', 'black')
+
+
+class MoveLog:
+    """Журнал ходов одной партии.
+
+    Записи накапливаются в буфере и сбрасываются в файл пачками.
+
+    Атрибуты:
+        path (str): Путь к файлу журнала.
+        sync (str): Политика fsync: ALWAYS — после каждой записи, BATCH — при сбросе пачки
+            и контрольной точке, NEVER — не вызывать fsync.
+        batch_size (int): Количество записей в пачке.
+        checkpoint_interval (int): Количество ходов между контрольными точками.
+    """
+
+    def __init__(self, path: str, sync: str = BATCH, batch_size: int = 16, checkpoint_interval: int = 64):
+        """Открывает журнал для дописывания, создавая файл с заголовком при необходимости.
+
+        Аргументы:
+            path (str): Путь к файлу журнала.
+            sync (str): Политика fsync (ALWAYS, BATCH или NEVER).
+            batch_size (int): Количество записей в пачке.
+            checkpoint_interval (int): Количество ходов между контрольными точками.
+
+        Исключения:
+            ValueError: Неизвестная политика fsync.
+        """
+        if sync not in (ALWAYS, BATCH, NEVER):
+            raise ValueError(f"Неизвестная политика fsync: {sync}")
+        self.path = path
+        self.sync = sync
+        self.batch_size = 1 if sync == ALWAYS else batch_size
+        self.checkpoint_interval = checkpoint_interval
+        self._buffer = bytearray()
+        self._pending_records = 0
+        self._since_checkpoint = 0
+        self._file: BinaryIO = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._buffer += MAGIC
+
+    def record(self, session: GameSession, start: Tuple[int, int], end: Tuple[int, int],
+               step: Optional[Tuple[int, int]] = None):
+        """Записывает выполненный ход и при необходимости контрольную точку.
+
+        Вызывается из `GameSession.play` после успешного хода.
+
+        Аргументы:
+            session (GameSession): Партия (уже после хода).
+            start (Tuple[int, int]): Начальная позиция.
+            end (Tuple[int, int]): Конечная позиция.
+            step (Optional[Tuple[int, int]]): Клетка второго шага двухшагового хода.
+        """
+        self._append(session.history[-1][0], start, end, step)
+        self._pending_records += 1
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint(session)
+        elif self._pending_records >= self.batch_size:
+            self.flush()
+
+    def record_many(self, session: GameSession, moves: List[tuple]):
+        """Записывает несколько выполненных ходов и завершает их контрольной точкой.
+
+        Аргументы:
+            session (GameSession): Партия (уже после всех ходов).
+            moves (List[tuple]): Ходы в формате `GameSession.history`.
+        """
+        for move in moves:
+            self._append(*move)
+        self.checkpoint(session)
+
+    def _append(self, color: str, start: Tuple[int, int], end: Tuple[int, int],
+                step: Optional[Tuple[int, int]] = None):
+        """Добавляет запись хода в буфер."""
+        if step is None:
+            self._buffer += MOVE
+            self._buffer += _MOVE.pack(_COLORS.index(color), start[0], start[1], end[0], end[1])
+        else:
+            self._buffer += STEP_MOVE
+            self._buffer += _STEP_MOVE.pack(_COLORS.index(color), start[0], start[1], end[0], end[1],
+                                            step[0], step[1])
+
+    def checkpoint(self, session: GameSession):
+        """Записывает контрольную точку с текущим состоянием партии и сбрасывает буфер.
+
+        Аргументы:
+            session (GameSession): Партия.
+        """
+        pending = session.pending or (_NO_SQUARE, _NO_SQUARE)
+        self._buffer += CHECKPOINT
+        self._buffer += _CHECKPOINT.pack(_COLORS.index(session.current_player), session.move_counter,
+                                         session.board.size, pending[0], pending[1])
+        self._buffer += session.board.pack()
+        self._since_checkpoint = 0
+        self.flush()
+
+    def flush(self):
+        """Записывает буфер в файл и вызывает fsync согласно политике."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        if self.sync != NEVER:
+            os.fsync(self._file.fileno())
+        self._pending_records = 0
+
+    def close(self):
+        """Сбрасывает буфер и закрывает файл."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_log(path: str) -> Tuple[Optional[tuple], List[tuple], int, int]:
+    """Читает журнал.
+
+    Аргументы:
+        path (str): Путь к файлу журнала.
+
+    Возвращает:
+        tuple: (последняя контрольная точка или None, все ходы журнала в формате
+            `GameSession.history`, номер первого хода после контрольной точки, длина корректной
+            части файла). Контрольная точка — кортеж (цвет,
+            счетчик ходов, клетка серии или None, упакованная доска).
+
+    Исключения:
+        ValueError: Файл не является журналом ходов.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path}: не журнал ходов")
+
+    checkpoint = None
+    moves = []
+    replay_from = 0
+    offset = valid = len(MAGIC)
+    while offset < len(data):
+        valid = offset
+        kind = data[offset:offset + 1]
+        offset += 1
+        if kind == MOVE:
+            if offset + _MOVE.size > len(data):
+                break
+            color, start_row, start_col, end_row, end_col = _MOVE.unpack_from(data, offset)
+            offset += _MOVE.size
+            moves.append((_COLORS[color], (start_row, start_col), (end_row, end_col)))
+        elif kind == STEP_MOVE:
+            if offset + _STEP_MOVE.size > len(data):
+                break
+            color, start_row, start_col, end_row, end_col, step_row, step_col = _STEP_MOVE.unpack_from(data, offset)
+            offset += _STEP_MOVE.size
+            moves.append((_COLORS[color], (start_row, start_col), (end_row, end_col), (step_row, step_col)))
+        elif kind == CHECKPOINT:
+            if offset + _CHECKPOINT.size > len(data):
+                break
+            color, move_counter, size, pending_row, pending_col = _CHECKPOINT.unpack_from(data, offset)
+            offset += _CHECKPOINT.size
+            packed = data[offset:offset + size * size]
+            if len(packed) < size * size:
+                break
+            offset += size * size
+            pending = None if pending_row == _NO_SQUARE else (pending_row, pending_col)
+            checkpoint = (_COLORS[color], move_counter, pending, packed)
+            replay_from = len(moves)
+        else:
+            break
+        valid = offset
+    return checkpoint, moves, replay_from, valid
+
+
+def open_session(path: str, rules: Rules, **options) -> GameSession:
+    """Открывает партию с журналом: восстанавливает ее из файла или начинает новую.
+
+    Аргументы:
+        path (str): Путь к файлу журнала.
+        rules (Rules): Правила игры.
+        **options: Параметры `MoveLog` (sync, batch_size, checkpoint_interval).
+
+    Возвращает:
+        GameSession: Партия, ходы которой дописываются в журнал.
+    """
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        session = restore(path, rules)
+        valid = read_log(path)[3]
+        if os.path.getsize(path) > valid:
+            os.truncate(path, valid)
+        session.journal = MoveLog(path, **options)
+        return session
+
+    session = GameSession(rules)
+    session.journal = MoveLog(path, **options)
+    session.journal.checkpoint(session)
+    return session
+
+
+def restore(path: str, rules: Rules) -> GameSession:
+    """Восстанавливает партию из журнала без подключения журнала к ней.
+
+    Аргументы:
+        path (str): Путь к файлу журнала.
+        rules (Rules): Правила игры.
+
+    Возвращает:
+        GameSession: Восстановленная партия.
+
+    Исключения:
+        ValueError: Файл не является журналом или ход из журнала не удалось повторить.
+    """
+    checkpoint, moves, replay_from, _ = read_log(path)
+    if checkpoint is None:
+        session = GameSession(rules)
+    else:
+        current_player, move_counter, pending, packed = checkpoint
+        session = GameSession.from_state(rules, rules.board_type.unpack(packed), current_player, move_counter, pending)
+    session.history = moves[:replay_from]
+
+    for color, *squares in moves[replay_from:]:
+        if color != session.current_player or not session.play(*squares).ok:
+            raise ValueError(f"{path}: не удалось повторить ход {' -> '.join(map(str, squares))}")
+    return session
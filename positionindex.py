@@ -0,0 +1,369 @@
+"""Индекс позиций архива партий: в каких партиях встречалась позиция.
+
+Архив — текстовый файл в формате `bench.py --script`: одна партия в строке,
+ходы через пробел. Индексатор переигрывает каждую партию через
+`GameSession`, вычисляет хэш каждой позиции после завершенного хода (вместе
+с начальной) и записывает пары (хэш, смещение строки партии в архиве).
+Повторы позиции внутри одной партии записываются один раз.
+
+Архив читается потоково: пары копятся в буфере не больше `run_size`
+записей, буфер сортируется и сбрасывается во временный файл (серию), а
+серии затем сливаются слиянием k путей, поэтому память не зависит от
+размера архива.
+
+Файл индекса:
+
+* заголовок ``PRPGIDX1``, вариант игры (16 байт), записей в блоке (uint32),
+  количество записей (uint64), смещение таблицы блоков (uint64);
+* записи (хэш uint64, смещение партии uint64), отсортированные по хэшу;
+* таблица блоков: первый хэш каждого блока (uint64).
+
+Поиск загружает только таблицу блоков и читает блоки, в которых может
+находиться хэш, найденные двоичным поиском.
+
+Запуск:
+    python positionindex.py build games.txt games.idx --variant chess
+    python positionindex.py query games.idx games.txt e2e4 e7e5
+"""
+
+import heapq
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from contextlib import suppress
+from hashlib import blake2b
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from bench import parse_scripted_move
+from session import VARIANTS, GameSession, Rules
+
+MAGIC = b'PRPGIDX1'
+
+_HEADER = struct.Struct('<16sIQQ')
+_ENTRY = struct.Struct('<QQ')
+_FIRST = struct.Struct('<Q')
+_COLORS = ('white', 'black')
+_CHUNK = 4096
+
+
+def position_hash(board, turn: str) -> int:
+    """Вычисляет 64-битный хэш позиции.
+
+    Аргументы:
+        board: Доска `chess.Board` или `checkers.Board`.
+        turn (str): Сторона, которая ходит.
+
+    Возвращает:
+        int: Хэш упакованной доски и стороны, которая ходит.
+    """
+    digest = blake2b(bytes((_COLORS.index(turn),)) + board.pack(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def game_positions(rules: Rules, moves: Sequence[str]) -> Iterator[int]:
+    """Переигрывает партию и возвращает хэши ее позиций, включая начальную.
+
+    Позиции внутри серии взятий шашек не учитываются: хэш вычисляется после
+    завершенного хода.
+
+    Аргументы:
+        rules (Rules): Правила игры.
+        moves (Sequence[str]): Записанные ходы партии.
+
+    Возвращает:
+        Iterator[int]: Хэши позиций по порядку.
+
+    Исключения:
+        ValueError: Ход записан некорректно или недопустим.
+    """
+    session = GameSession(rules)
+    geometry = session.board.geometry
+    yield position_hash(session.board, session.current_player)
+    for text in moves:
+        moves_played = parse_scripted_move(rules, text, geometry)
+        if moves_played is None:
+            raise ValueError(f"Некорректная запись хода: {text}")
+        for squares in moves_played:
+            if not session.play(*squares).ok:
+                raise ValueError(f"Недопустимый ход: {text}")
+        if session.pending is None:
+            yield position_hash(session.board, session.current_player)
+
+
+def _write_run(entries: List[Tuple[int, int]], directory: str) -> str:
+    """Сортирует записи и сохраняет их во временный файл серии."""
+    entries.sort()
+    handle, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(handle, 'wb') as file:
+        for start in range(0, len(entries), _CHUNK):
+            file.write(b''.join(_ENTRY.pack(*entry) for entry in entries[start:start + _CHUNK]))
+    return path
+
+
+def _read_run(path: str) -> Iterator[Tuple[int, int]]:
+    """Читает записи серии кусками."""
+    with open(path, 'rb') as file:
+        while True:
+            data = file.read(_ENTRY.size * _CHUNK)
+            if not data:
+                return
+            yield from _ENTRY.iter_unpack(data)
+
+
+def _merge_runs(paths: List[str], directory: str, fan_in: int) -> List[str]:
+    """Сливает серии группами по `fan_in`, пока их не останется не больше `fan_in`.
+
+    При ошибке удаляет серии, созданные во время слияния; исходные серии удаляет вызывающий.
+    """
+    while len(paths) > fan_in:
+        merged = []
+        try:
+            for start in range(0, len(paths), fan_in):
+                group = paths[start:start + fan_in]
+                handle, path = tempfile.mkstemp(suffix='.run', dir=directory)
+                merged.append(path)
+                with os.fdopen(handle, 'wb') as file:
+                    _write_entries(file, heapq.merge(*map(_read_run, group)))
+                for used in group:
+                    os.remove(used)
+        except BaseException:
+            for path in merged:
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+            raise
+        paths = merged
+    return paths
+
+
+def _write_entries(file: BinaryIO, entries, block_size: int = 0) -> Tuple[int, List[int]]:
+    """Записывает отсортированные записи без повторов.
+
+    Возвращает:
+        Tuple[int, List[int]]: Количество записей и первые хэши блоков (если block_size > 0).
+    """
+    count = 0
+    firsts = []
+    previous = None
+    buffer = []
+    for entry in entries:
+        if entry == previous:
+            continue
+        previous = entry
+        if block_size and count % block_size == 0:
+            firsts.append(entry[0])
+        buffer.append(_ENTRY.pack(*entry))
+        count += 1
+        if len(buffer) == _CHUNK:
+            file.write(b''.join(buffer))
+            buffer.clear()
+    file.write(b''.join(buffer))
+    return count, firsts
+
+
+def build_index(archive: str, index: str, variant: str = 'chess', run_size: int = 1 << 20,
+                block_size: int = 256, fan_in: int = 64) -> Dict[str, int]:
+    """Строит индекс позиций архива.
+
+    Аргументы:
+        archive (str): Путь к архиву партий.
+        index (str): Путь к создаваемому файлу индекса (заменяется атомарно).
+        variant (str): Вариант игры из `session.VARIANTS`.
+        run_size (int): Наибольшее количество записей в памяти до сброса серии на диск.
+        block_size (int): Количество записей в блоке индекса.
+        fan_in (int): Наибольшее количество серий, сливаемых за один проход.
+
+    Возвращает:
+        Dict[str, int]: games (проиндексировано партий), skipped (партий с недопустимыми
+            ходами), positions (уникальных пар позиция–партия), runs (серий на диске).
+
+    Исключения:
+        ValueError: Неизвестный вариант игры или некорректные параметры.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Неизвестный вариант игры: {variant}")
+    if run_size <= 0 or block_size <= 0 or fan_in < 2:
+        raise ValueError("Некорректные параметры индексатора")
+    rules = VARIANTS[variant]()
+    directory = os.path.dirname(os.path.abspath(index))
+    stats = {'games': 0, 'skipped': 0, 'positions': 0, 'runs': 0}
+    runs: List[str] = []
+    entries: List[Tuple[int, int]] = []
+    try:
+        with open(archive, 'rb') as file:
+            offset = 0
+            for line in file:
+                try:
+                    moves = line.decode('utf-8').split()
+                    hashes = set(game_positions(rules, moves)) if moves else None
+                except ValueError:
+                    stats['skipped'] += 1
+                else:
+                    if hashes is not None:
+                        stats['games'] += 1
+                        entries.extend((value, offset) for value in hashes)
+                        if len(entries) >= run_size:
+                            runs.append(_write_run(entries, directory))
+                            entries = []
+                offset += len(line)
+        if entries:
+            runs.append(_write_run(entries, directory))
+            entries = []
+        stats['runs'] = len(runs)
+        runs = _merge_runs(runs, directory, fan_in)
+
+        handle, temp = tempfile.mkstemp(suffix='.idx', dir=directory)
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(MAGIC + _HEADER.pack(variant.encode('ascii'), block_size, 0, 0))
+                count, firsts = _write_entries(file, heapq.merge(*map(_read_run, runs)), block_size)
+                table = file.tell()
+                file.write(b''.join(_FIRST.pack(first) for first in firsts))
+                file.seek(len(MAGIC))
+                file.write(_HEADER.pack(variant.encode('ascii'), block_size, count, table))
+            os.replace(temp, index)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(temp)
+            raise
+        stats['positions'] = count
+        return stats
+    finally:
+        for path in runs:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+
+class PositionIndex:
+    """Файл индекса позиций, открытый для поиска.
+
+    Атрибуты:
+        path (str): Путь к файлу индекса.
+        variant (str): Вариант игры, для которого построен индекс.
+        count (int): Количество записей.
+        block_size (int): Количество записей в блоке.
+    """
+
+    def __init__(self, path: str):
+        """Открывает индекс и загружает таблицу блоков.
+
+        Аргументы:
+            path (str): Путь к файлу индекса.
+
+        Исключения:
+            ValueError: Файл не является индексом позиций.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        header = self._file.read(len(MAGIC) + _HEADER.size)
+        if header[:len(MAGIC)] != MAGIC or len(header) != len(MAGIC) + _HEADER.size:
+            self._file.close()
+            raise ValueError(f"Файл {path} не является индексом позиций")
+        variant, self.block_size, self.count, table = _HEADER.unpack_from(header, len(MAGIC))
+        self.variant = variant.rstrip(b'\0').decode('ascii')
+        self._data = len(header)
+        self._file.seek(table)
+        self._firsts = [first for first, in _FIRST.iter_unpack(self._file.read())]
+
+    def _block(self, number: int) -> List[Tuple[int, int]]:
+        """Читает записи блока."""
+        first = number * self.block_size
+        self._file.seek(self._data + first * _ENTRY.size)
+        size = min(self.block_size, self.count - first)
+        return list(_ENTRY.iter_unpack(self._file.read(size * _ENTRY.size)))
+
+    def lookup_hash(self, value: int) -> List[int]:
+        """Возвращает смещения партий, в которых встретилась позиция с данным хэшем.
+
+        Аргументы:
+            value (int): Хэш позиции (`position_hash`).
+
+        Возвращает:
+            List[int]: Смещения строк партий в архиве по возрастанию.
+        """
+        number = max(bisect_left(self._firsts, value) - 1, 0)
+        offsets = []
+        while number < len(self._firsts) and self._firsts[number] <= value:
+            for entry_hash, offset in self._block(number):
+                if entry_hash == value:
+                    offsets.append(offset)
+                elif entry_hash > value:
+                    return offsets
+            number += 1
+        return offsets
+
+    def lookup(self, board, turn: str) -> List[int]:
+        """Возвращает смещения партий, в которых встретилась позиция.
+
+        Аргументы:
+            board: Доска.
+            turn (str): Сторона, которая ходит.
+
+        Возвращает:
+            List[int]: Смещения строк партий в архиве по возрастанию.
+        """
+        return self.lookup_hash(position_hash(board, turn))
+
+    def close(self):
+        """Закрывает файл индекса."""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_game(archive: str, offset: int) -> List[str]:
+    """Читает партию архива по смещению из индекса.
+
+    Аргументы:
+        archive (str): Путь к архиву партий.
+        offset (int): Смещение строки партии.
+
+    Возвращает:
+        List[str]: Записанные ходы партии.
+    """
+    with open(archive, 'rb') as file:
+        file.seek(offset)
+        return file.readline().decode('utf-8').split()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Разбирает аргументы командной строки: построение индекса или поиск позиции."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Индекс позиций архива партий.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Построить индекс архива.")
+    build.add_argument('archive')
+    build.add_argument('index')
+    build.add_argument('--variant', choices=sorted(VARIANTS), default='chess')
+    build.add_argument('--run-size', type=int, default=1 << 20)
+    build.add_argument('--block-size', type=int, default=256)
+    query = commands.add_parser('query', help="Найти партии, дошедшие до позиции после ходов.")
+    query.add_argument('index')
+    query.add_argument('archive')
+    query.add_argument('moves', nargs='*')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        stats = build_index(args.archive, args.index, args.variant, args.run_size, args.block_size)
+        print(f"партий: {stats['games']} (пропущено {stats['skipped']}), записей: {stats['positions']}, "
+              f"серий: {stats['runs']}")
+        return
+    with PositionIndex(args.index) as index:
+        try:
+            *_, value = game_positions(VARIANTS[index.variant](), args.moves)
+        except ValueError as error:
+            print(f"Ошибка: {error}")
+            raise SystemExit(1)
+        offsets = index.lookup_hash(value)
+    print(f"партий с позицией: {len(offsets)}")
+    for offset in offsets:
+        print(f"{offset}: {' '.join(read_game(args.archive, offset))}")
+
+
+if __name__ == '__main__':
+    main()
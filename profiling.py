@@ -0,0 +1,160 @@
+"""Счетчики вызовов и времени для горячих методов правил.
+
+Пока профилирование выключено, классы правил не изменяются, поэтому
+накладных расходов нет. `enable()` подменяет методы из `METHODS` во всех
+классах модулей `chess` и `checkers` обертками, которые считают вызовы и
+суммарное время отдельно для каждого типа фигуры или доски; `disable()`
+возвращает исходные методы. Время включает вложенные вызовы: например,
+время `Board.is_check` содержит время вызванных из него `can_move`.
+
+Пример:
+    import profiling
+    with profiling.profiled():
+        board.move_piece((6, 4), (4, 4))
+    print(profiling.dump_json())
+"""
+
+import inspect
+import json
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Tuple
+
+MODULES = ('chess', 'checkers')
+METHODS = ('can_move', 'is_move', 'get_moves', 'move_piece', 'is_check', 'generate_moves', 'legal_moves',
+           'iter_legal_moves', 'apply_moves')
+
+_stats: Dict[Tuple[str, str, str], List[int]] = {}
+_patched: List[Tuple[type, str, object]] = []
+
+
+def _record(key: Tuple[str, str, str], elapsed: int):
+    """Добавляет вызов и его время к статистике метода."""
+    stat = _stats.get(key)
+    if stat is None:
+        _stats[key] = [1, elapsed]
+    else:
+        stat[0] += 1
+        stat[1] += elapsed
+
+
+def _wrap(module_name: str, name: str, func):
+    """Создает обертку, которая считает вызовы и время метода `func`.
+
+    Для генераторов учитывается время всех шагов итерации, а не только создания генератора.
+    """
+    if inspect.isgeneratorfunction(func):
+        def wrapper(self, *args, **kwargs):
+            elapsed = 0
+            iterator = func(self, *args, **kwargs)
+            try:
+                while True:
+                    started = perf_counter_ns()
+                    try:
+                        value = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += perf_counter_ns() - started
+                    yield value
+            finally:
+                _record((module_name, type(self).__name__, name), elapsed)
+    else:
+        def wrapper(self, *args, **kwargs):
+            started = perf_counter_ns()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                _record((module_name, type(self).__name__, name), perf_counter_ns() - started)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """Возвращает True, если профилирование включено."""
+    return bool(_patched)
+
+
+def enable():
+    """Включает профилирование, подменяя методы правил обертками.
+
+    Повторный вызов ничего не делает.
+    """
+    if _patched:
+        return
+    import importlib
+
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for value in list(vars(module).values()):
+            if not isinstance(value, type) or value.__module__ != module.__name__:
+                continue
+            for name in METHODS:
+                func = value.__dict__.get(name)
+                if callable(func):
+                    _patched.append((value, name, func))
+                    setattr(value, name, _wrap(module_name, name, func))
+
+
+def disable():
+    """Выключает профилирование и восстанавливает исходные методы.
+
+    Накопленная статистика сохраняется до вызова `reset()`.
+    """
+    while _patched:
+        owner, name, func = _patched.pop()
+        setattr(owner, name, func)
+
+
+def reset():
+    """Сбрасывает накопленную статистику."""
+    _stats.clear()
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Возвращает копию накопленной статистики.
+
+    Возвращает:
+        Dict[str, Dict[str, float]]: Для ключа вида 'chess.DancingKnight.can_move' —
+            число вызовов ('calls'), суммарное время в секундах ('total_s')
+            и среднее время вызова в микросекундах ('mean_us').
+    """
+    result = {}
+    for (module_name, owner, name), (calls, total_ns) in sorted(_stats.items()):
+        result[f"{module_name}.{owner}.{name}"] = {
+            'calls': calls,
+            'total_s': total_ns / 1e9,
+            'mean_us': total_ns / calls / 1e3,
+        }
+    return result
+
+
+def dump_json(path: Optional[str] = None) -> str:
+    """Сериализует статистику в JSON.
+
+    Аргументы:
+        path (Optional[str]): Путь к файлу; если указан, JSON также записывается в файл.
+
+    Возвращает:
+        str: Статистика в формате JSON.
+    """
+    text = json.dumps(snapshot(), indent=2, sort_keys=True)
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+    return text
+
+
+@contextmanager
+def profiled():
+    """Контекстный менеджер, включающий профилирование на время блока."""
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
@@ -0,0 +1,274 @@
+"""Регрессионный прогон правил по корпусу позиций с ограничением времени.
+
+Корпус (`regression_corpus.json`) — список позиций с ожидаемыми
+результатами. Позиция задается вариантом игры (`session.VARIANTS`) и либо
+записанными ходами от начальной расстановки (как в `bench.py --script`),
+либо расстановкой по строкам сверху вниз через '/' (символы фигур как в
+`Board.pack`, число — количество пустых клеток подряд), стороной, которая
+ходит, и клеткой незавершенной серии взятий.
+
+Для каждой позиции выполняются операции из `expect`:
+
+* ``legal`` — множество допустимых ходов ('e2e4', двухшаговый 'a1-b3-c4',
+  в шашках 'c3-d4' или взятие 'c3xe5');
+* ``status`` — шах, мат и пат (см. `analysis.mate_check`);
+* ``chains`` — полные серии взятий шашек ('c3xe5xg7');
+* ``best`` — лучший ход и его оценка на заданных глубинах (см. `analysis.best_move`);
+* ``perft`` — количество позиций на заданных глубинах.
+
+Каждая операция повторяется несколько раз; лучшее время должно уложиться в
+бюджет операции (`BUDGETS_MS` или `budget_ms` позиции), умноженный на
+`--scale`. Результат должен совпасть с ожидаемым. `--update` записывает в
+корпус текущие результаты вместо проверки.
+
+Запуск:
+    python regression.py
+    python regression.py -k checkers --scale 3
+    python regression.py --update
+"""
+
+import json
+import os
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analysis import best_move, mate_check, perft
+from bench import parse_scripted_move
+from notation import parse_square
+from session import VARIANTS, GameSession
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regression_corpus.json')
+
+BUDGETS_MS = {
+    'legal': 5.0,
+    'status': 5.0,
+    'chains': 5.0,
+    'best': 50.0,
+    'perft': 50.0,
+}
+
+Position = Tuple[int, int]
+
+
+def parse_placement(text: str) -> bytes:
+    """Переводит расстановку 'rnbqkbnr/pppppppp/8/...' в формат `Board.pack`.
+
+    Аргументы:
+        text (str): Строки доски сверху вниз через '/'.
+
+    Возвращает:
+        bytes: Упакованная доска.
+
+    Исключения:
+        ValueError: Строки разной длины или доска не квадратная.
+    """
+    rows = []
+    for line in text.split('/'):
+        row = bytearray()
+        digits = ''
+        for symbol in line + '/':
+            if symbol.isdigit():
+                digits += symbol
+                continue
+            if digits:
+                row.extend(bytes(int(digits)))
+                digits = ''
+            if symbol != '/':
+                row.append(ord(symbol))
+        rows.append(bytes(row))
+    if any(len(row) != len(rows) for row in rows):
+        raise ValueError(f"Расстановка не образует квадратную доску: {text}")
+    return b''.join(rows)
+
+
+def build_session(case: dict) -> GameSession:
+    """Создает партию в позиции из корпуса.
+
+    Аргументы:
+        case (dict): Позиция корпуса.
+
+    Возвращает:
+        GameSession: Партия в заданной позиции.
+
+    Исключения:
+        ValueError: Позиция описана некорректно.
+    """
+    rules = VARIANTS[case['variant']]()
+    if 'placement' in case:
+        board = rules.board_type.unpack(parse_placement(case['placement']))
+        pending = parse_square(case['pending'], board.geometry) if case.get('pending') else None
+        return GameSession.from_state(rules, board, case.get('turn', 'white'), pending=pending)
+    session = GameSession(rules)
+    geometry = session.board.geometry
+    for text in case.get('moves', ()):
+        moves_played = parse_scripted_move(session.rules, text, geometry)
+        if moves_played is None or not all(session.play(*squares).ok for squares in moves_played):
+            raise ValueError(f"Недопустимый ход {text} в позиции {case['name']}")
+    return session
+
+
+def _format(session: GameSession, move: Sequence[Position], capture: bool) -> str:
+    """Записывает ход в нотации корпуса."""
+    return session.rules.format_move(move, capture, session.board.geometry)
+
+
+def _legal(session: GameSession, argument) -> List[str]:
+    """Допустимые ходы текущего игрока."""
+    capture = bool(session.required_moves())
+    return sorted(_format(session, move, capture) for move in session.legal_moves())
+
+
+def _status(session: GameSession, argument) -> Dict[str, bool]:
+    """Шах, мат и пат текущего игрока."""
+    return mate_check(session.rules, session.board, session.current_player, session.pending)
+
+
+def _chains(session: GameSession, argument) -> List[str]:
+    """Полные серии взятий шашек текущего игрока."""
+    board = session.board
+    chains = []
+
+    def extend(squares):
+        continuations = board.captures_from(squares[-1])
+        if not continuations:
+            chains.append(_format(session, squares, True))
+            return
+        for start, end in continuations:
+            undo = board.make_move(start, end)
+            extend(squares + [end])
+            board.unmake_move(undo)
+
+    if session.pending is not None:
+        starts = [session.pending]
+    else:
+        starts = sorted({start for start, _ in board.capture_moves(session.current_player)})
+    for start in starts:
+        for _, end in board.captures_from(start):
+            undo = board.make_move(start, end)
+            extend([start, end])
+            board.unmake_move(undo)
+    return sorted(chains)
+
+
+def _best(session: GameSession, depths) -> Dict[str, list]:
+    """Лучший ход и его оценка на каждой из глубин (None, если ходов нет)."""
+    capture = bool(session.required_moves())
+    results = {}
+    for depth in depths:
+        best = best_move(session.rules, session.board, session.current_player, int(depth), session.pending)
+        results[str(depth)] = None if best is None else [_format(session, best[0], capture), best[1]]
+    return results
+
+
+def _perft(session: GameSession, depths) -> Dict[str, int]:
+    """Количество позиций на каждой из глубин."""
+    return {str(depth): perft(session.rules, session.board, session.current_player, int(depth), session.pending)
+            for depth in depths}
+
+
+OPERATIONS = {
+    'legal': _legal,
+    'status': _status,
+    'chains': _chains,
+    'best': _best,
+    'perft': _perft,
+}
+
+
+def run_case(case: dict, repeat: int = 3, scale: float = 1.0) -> Tuple[Dict[str, object], List[str]]:
+    """Выполняет операции позиции и сравнивает результаты с ожидаемыми.
+
+    Аргументы:
+        case (dict): Позиция корпуса.
+        repeat (int): Количество повторов каждой операции (берется лучшее время).
+        scale (float): Множитель бюджетов времени.
+
+    Возвращает:
+        Tuple[Dict[str, object], List[str]]: Результаты операций и список найденных расхождений.
+    """
+    results = {}
+    problems = []
+    budgets = dict(BUDGETS_MS, **case.get('budget_ms', {}))
+    for operation, expected in case['expect'].items():
+        if operation not in OPERATIONS:
+            problems.append(f"{operation}: неизвестная операция")
+            continue
+        argument = sorted(expected, key=int) if operation in ('best', 'perft') else None
+        best = None
+        for _ in range(max(repeat, 1)):
+            session = build_session(case)
+            started = perf_counter_ns()
+            result = OPERATIONS[operation](session, argument)
+            elapsed = (perf_counter_ns() - started) / 1e6
+            best = elapsed if best is None else min(best, elapsed)
+        results[operation] = result
+        if result != expected:
+            problems.append(f"{operation}: ожидалось {expected}, получено {result}")
+        if best > budgets[operation] * scale:
+            problems.append(f"{operation}: {best:.2f} мс при бюджете {budgets[operation] * scale:.2f} мс")
+    return results, problems
+
+
+def load_corpus(path: str = CORPUS) -> List[dict]:
+    """Читает корпус позиций.
+
+    Аргументы:
+        path (str): Путь к файлу корпуса.
+
+    Возвращает:
+        List[dict]: Позиции корпуса.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def run(cases: List[dict], repeat: int = 3, scale: float = 1.0, update: bool = False) -> int:
+    """Прогоняет позиции корпуса и печатает отчет.
+
+    Аргументы:
+        cases (List[dict]): Позиции корпуса.
+        repeat (int): Количество повторов каждой операции.
+        scale (float): Множитель бюджетов времени.
+        update (bool): Записать текущие результаты в `expect` вместо проверки.
+
+    Возвращает:
+        int: Количество позиций с расхождениями.
+    """
+    failed = 0
+    for case in cases:
+        results, problems = run_case(case, repeat, scale)
+        if update:
+            case['expect'] = results
+            problems = [problem for problem in problems if 'бюджет' in problem]
+        print(f"{'FAIL' if problems else 'ok  '} {case['name']}")
+        for problem in problems:
+            print(f"     {problem}")
+        failed += bool(problems)
+    print(f"позиций: {len(cases)}, с расхождениями: {failed}")
+    return failed
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Разбирает аргументы командной строки и завершает процесс с кодом 1 при расхождениях."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Регрессионный прогон правил по корпусу позиций.")
+    parser.add_argument('--corpus', default=CORPUS)
+    parser.add_argument('-k', dest='pattern', default='', help="Прогнать только позиции, имя которых содержит строку.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0, help="Множитель бюджетов времени.")
+    parser.add_argument('--update', action='store_true', help="Записать текущие результаты в корпус.")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    cases = [case for case in corpus if args.pattern in case['name']]
+    failed = run(cases, args.repeat, args.scale, args.update)
+    if args.update:
+        with open(args.corpus, 'w', encoding='utf-8') as file:
+            json.dump(corpus, file, ensure_ascii=False, indent=1)
+            file.write('\n')
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
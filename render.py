@@ -0,0 +1,117 @@
+"""Текстовая отрисовка доски.
+
+`render_board` строит изображение доски целиком. `BoardRenderer` хранит уже
+построенные строки и после хода перестраивает только строки, затронутые
+изменившимися клетками; метод `diff` отдает лишь изменившиеся клетки, что
+удобно для передачи удаленным клиентам.
+"""
+
+from typing import List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+
+def _symbol(piece) -> str:
+    """Возвращает символ клетки: символ фигуры или '.' для пустой клетки."""
+    return str(piece) if piece else '.'
+
+
+def _format_row(board, row: int, symbols: List[str]) -> str:
+    """Собирает строку доски с подписями номера горизонтали."""
+    rank = board.size - row
+    return f"{rank:>{board.geometry.rank_width}} {' '.join(symbols)} {rank}"
+
+
+def render_board(board) -> str:
+    """Возвращает полное строковое представление доски.
+
+    Аргументы:
+        board (Board): Шахматная или шашечная доска.
+
+    Возвращает:
+        str: Строковое представление доски с координатами.
+    """
+    header = board.geometry.header
+    result = [header]
+    for i, row in enumerate(board.board):
+        result.append(_format_row(board, i, [_symbol(piece) for piece in row]))
+    result.append(header)
+    return '\n'.join(result)
+
+
+class BoardRenderer:
+    """Отрисовщик доски с кэшированием строк.
+
+    Доска отмечает измененные клетки в атрибуте `changed`; отрисовщик забирает
+    эти отметки и перестраивает только соответствующие строки. На одну доску
+    должен приходиться один отрисовщик.
+
+    Атрибуты:
+        board (Board): Отрисовываемая доска.
+    """
+
+    def __init__(self, board):
+        """Инициализирует отрисовщик и строит кэш для текущего состояния доски.
+
+        Аргументы:
+            board (Board): Шахматная или шашечная доска.
+        """
+        self.board = board
+        self.invalidate()
+
+    def invalidate(self):
+        """Полностью перестраивает кэш.
+
+        Нужен после изменений, сделанных в обход `set_piece` и `move_piece`
+        (например, прямой записью в `board.board`).
+        """
+        board = self.board
+        self._symbols = [[_symbol(piece) for piece in row] for row in board.board]
+        self._rows = [_format_row(board, i, symbols) for i, symbols in enumerate(self._symbols)]
+        self._dirty_rows = set()
+        self._text: Optional[str] = None
+        board.changed.clear()
+
+    def _collect(self) -> List[Tuple[Position, str]]:
+        """Забирает отметки доски и обновляет символы измененных клеток."""
+        changed = self.board.changed
+        if not changed:
+            return []
+        grid = self.board.board
+        symbols = self._symbols
+        result = []
+        for position in sorted(changed):
+            row, col = position
+            symbol = _symbol(grid[row][col])
+            if symbol != symbols[row][col]:
+                symbols[row][col] = symbol
+                self._dirty_rows.add(row)
+                result.append((position, symbol))
+        changed.clear()
+        return result
+
+    def render(self) -> str:
+        """Возвращает изображение доски, перестраивая только измененные строки.
+
+        Возвращает:
+            str: Строковое представление доски с координатами.
+        """
+        self._collect()
+        if self._dirty_rows:
+            for row in self._dirty_rows:
+                self._rows[row] = _format_row(self.board, row, self._symbols[row])
+            self._dirty_rows.clear()
+            self._text = None
+        if self._text is None:
+            header = self.board.geometry.header
+            self._text = '\n'.join([header, *self._rows, header])
+        return self._text
+
+    def diff(self) -> List[Tuple[str, str]]:
+        """Возвращает клетки, изменившиеся с прошлого вызова `diff` или `render`.
+
+        Возвращает:
+            List[Tuple[str, str]]: Пары (имя клетки, новый символ), например ('e4', 'P').
+        """
+        names = self.board.geometry.names
+        return [(names[position], symbol) for position, symbol in self._collect()]
@@ -0,0 +1,576 @@
+"""Игровая сессия без консольного ввода-вывода.
+
+`GameSession` хранит доску, сторону, которая ходит, счетчик ходов и историю,
+а правила конкретной игры подключаются объектом `Rules`: `ChessRules`
+(классические шахматы или произвольная расстановка), `FairyChessRules`
+(расстановка с нестандартными фигурами) и `CheckersRules` (шашки с
+обязательным взятием и продолжением серии взятий).
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import checkers
+import chess
+import notation
+
+Position = Tuple[int, int]
+
+OK = 'ok'
+INVALID = 'invalid'
+WRONG_PIECE = 'wrong_piece'
+ILLEGAL = 'illegal'
+CAPTURE_REQUIRED = 'capture_required'
+
+
+def opponent(color: str) -> str:
+    """Возвращает цвет противника.
+
+    Аргументы:
+        color (str): Цвет ('white' или 'black').
+
+    Возвращает:
+        str: Противоположный цвет.
+    """
+    return 'black' if color == 'white' else 'white'
+
+
+class MoveResult:
+    """Результат обработки хода.
+
+    Атрибуты:
+        status (str): OK, INVALID, WRONG_PIECE, ILLEGAL или CAPTURE_REQUIRED.
+        check (Optional[str]): Цвет короля, оказавшегося под шахом после хода.
+        continues (bool): Ход не завершен: та же шашка обязана продолжить взятие.
+    """
+
+    __slots__ = ('status', 'check', 'continues')
+
+    def __init__(self, status: str, check: Optional[str] = None, continues: bool = False):
+        """Инициализирует результат.
+
+        Аргументы:
+            status (str): Код результата.
+            check (Optional[str]): Цвет короля под шахом.
+            continues (bool): Требуется продолжение серии взятий.
+        """
+        self.status = status
+        self.check = check
+        self.continues = continues
+
+    @property
+    def ok(self) -> bool:
+        """True, если ход выполнен."""
+        return self.status == OK
+
+    def __repr__(self):
+        return f"MoveResult({self.status!r}, check={self.check!r}, continues={self.continues!r})"
+
+
+class Rules:
+    """Базовый класс правил игры, подключаемых к `GameSession`.
+
+    Атрибуты:
+        name (str): Название правил.
+        board_type (type): Класс доски (нужен для восстановления из упакованного вида).
+        piece_values (Dict[str, int]): Стоимость фигур по символу в верхнем регистре
+            (для оценки позиции в `analysis`).
+        texts (Dict[str, str]): Подсказки ввода ('start', 'end', 'step') и сообщения об ошибках
+            по статусу хода для консольного интерфейса.
+    """
+
+    name = ''
+    board_type: type = None
+    piece_values: Dict[str, int] = {}
+    texts: Dict[str, str] = {
+        'start': 'Введите координату фигуры, которой хотите воспользоваться (например, a2): ',
+        'end': 'Введите координату, куда хотите ее передвинуть (например, a4): ',
+        'step': 'Введите координату второго шага (соседнюю клетку, например, b5): ',
+        WRONG_PIECE: 'Вы не можете ходить фигурой противника или пустой клеткой.',
+        ILLEGAL: 'Невозможно выполнить ход.',
+    }
+
+    def create_board(self):
+        """Создает доску в начальной позиции.
+
+        Исключения:
+            NotImplementedError: Метод должен быть реализован в подклассе.
+        """
+        raise NotImplementedError("Метод должен быть реализован в подклассе")
+
+    def required_moves(self, session: 'GameSession') -> List[Tuple[Position, Position]]:
+        """Возвращает ходы, один из которых игрок обязан сделать (пустой список — ограничений нет).
+
+        Аргументы:
+            session (GameSession): Текущая сессия.
+        """
+        return []
+
+    def legal_moves(self, session: 'GameSession') -> List[Tuple[Position, ...]]:
+        """Возвращает все допустимые ходы текущего игрока (пустой список — партия окончена).
+
+        Ход — пара (откуда, куда) или тройка (откуда, клетка приземления, клетка второго шага),
+        которую можно передать в `GameSession.play`.
+
+        Аргументы:
+            session (GameSession): Текущая сессия.
+        """
+        return self.board_moves(session.board, session.current_player, session.pending)
+
+    def board_moves(self, board, color: str, pending: Optional[Position] = None) -> List[Tuple[Position, ...]]:
+        """Возвращает допустимые ходы стороны на доске без сессии (см. `legal_moves`).
+
+        Аргументы:
+            board: Доска.
+            color (str): Сторона, которая ходит.
+            pending (Optional[Position]): Клетка фигуры, обязанной продолжить серию взятий.
+
+        Исключения:
+            NotImplementedError: Метод должен быть реализован в подклассе.
+        """
+        raise NotImplementedError("Метод должен быть реализован в подклассе")
+
+    def search_moves(self, board, color: str,
+                     pending: Optional[Position] = None) -> Tuple[List[Tuple[Position, ...]], bool]:
+        """Возвращает допустимые ходы для перебора и признак того, что это обязательные взятия.
+
+        Аргументы:
+            board: Доска.
+            color (str): Сторона, которая ходит.
+            pending (Optional[Position]): Клетка фигуры, обязанной продолжить серию взятий.
+
+        Возвращает:
+            Tuple[List[Tuple[Position, ...]], bool]: Ходы и признак обязательных взятий
+                (после такого хода серия может продолжиться, см. `continues`).
+        """
+        return self.board_moves(board, color, pending), False
+
+    def continues(self, board, end: Position, captures: bool) -> bool:
+        """Проверяет, что после выполненного хода та же фигура обязана ходить еще раз.
+
+        Аргументы:
+            board: Доска после хода.
+            end (Position): Клетка, на которой закончила ход фигура.
+            captures (bool): Ход был обязательным взятием.
+        """
+        return False
+
+    def in_check(self, board, color: str) -> bool:
+        """Проверяет, что главная фигура стороны под боем (в играх без шаха всегда False).
+
+        Аргументы:
+            board: Доска.
+            color (str): Сторона.
+        """
+        return False
+
+    def is_stalemate(self, board, color: str) -> bool:
+        """Проверяет, что отсутствие ходов у стороны — ничья, а не поражение.
+
+        Аргументы:
+            board: Доска.
+            color (str): Сторона, у которой нет ходов.
+        """
+        return False
+
+    def requires_step(self, session: 'GameSession', start: Position, end: Position) -> bool:
+        """Проверяет, нужно ли для хода указать клетку второго шага (двухшаговый ход).
+
+        Аргументы:
+            session (GameSession): Текущая сессия.
+            start (Position): Начальная позиция.
+            end (Position): Конечная позиция.
+        """
+        return False
+
+    def split_move(self, squares: Sequence[Position]) -> Optional[List[Tuple[Position, ...]]]:
+        """Разбивает ход из `Board.apply_moves` на вызовы `GameSession.play`.
+
+        По умолчанию ход — пара клеток или тройка двухшагового хода и выполняется одним вызовом.
+
+        Аргументы:
+            squares (Sequence[Position]): Клетки хода по порядку.
+
+        Возвращает:
+            Optional[List[Tuple[Position, ...]]]: Клетки для каждого вызова `play` или None,
+                если в этих правилах такого хода быть не может.
+        """
+        return [tuple(squares)] if len(squares) in (2, 3) else None
+
+    def parse_move(self, text: str, geometry) -> Optional[Tuple[Position, ...]]:
+        """Разбирает запись хода: 'e2e4' или двухшаговый 'a1-b3-c4'.
+
+        Превращение пешки правилами не поддерживается, поэтому запись с фигурой превращения
+        ('e7e8q') считается некорректной.
+
+        Аргументы:
+            text (str): Запись хода.
+            geometry (Geometry): Геометрия доски.
+
+        Возвращает:
+            Optional[Tuple[Position, ...]]: Клетки хода или None, если запись некорректна.
+        """
+        move = notation.parse_move(text, geometry)
+        if move is None:
+            return notation.parse_chain(text, geometry)
+        return None if move[2] is not None else move[:2]
+
+    def format_move(self, squares: Sequence[Position], capture: bool, geometry) -> str:
+        """Записывает ход в нотации, которую понимает `parse_move`.
+
+        Аргументы:
+            squares (Sequence[Position]): Клетки хода.
+            capture (bool): Ход — обязательное взятие.
+            geometry (Geometry): Геометрия доски.
+
+        Возвращает:
+            str: Запись хода.
+        """
+        text = notation.format_chain(squares, capture, geometry)
+        return text.replace('-', '') if len(squares) == 2 else text
+
+    def apply_move(self, session: 'GameSession', start: Position, end: Position,
+                   step: Optional[Position] = None) -> MoveResult:
+        """Проверяет и выполняет ход стороны `session.current_player`.
+
+        Аргументы:
+            session (GameSession): Текущая сессия.
+            start (Position): Начальная позиция.
+            end (Position): Конечная позиция.
+            step (Optional[Position]): Клетка второго шага двухшагового хода.
+
+        Исключения:
+            NotImplementedError: Метод должен быть реализован в подклассе.
+        """
+        raise NotImplementedError("Метод должен быть реализован в подклассе")
+
+
+class ChessRules(Rules):
+    """Правила шахмат.
+
+    Атрибуты:
+        size (int): Размер доски.
+        placement (Optional[Sequence[Tuple[Position, type, str]]]): Расстановка в виде
+            (позиция, класс фигуры, цвет); None — стандартная расстановка.
+    """
+
+    name = 'chess'
+    board_type = chess.Board
+    piece_values = {'P': 100, 'N': 300, 'B': 320, 'R': 500, 'Q': 900, 'K': 0, 'D': 650, 'T': 550, 'H': 400}
+    placement: Optional[Sequence[Tuple[Position, type, str]]] = None
+
+    def __init__(self, placement: Optional[Sequence[Tuple[Position, type, str]]] = None, size: int = 8):
+        """Инициализирует правила.
+
+        Аргументы:
+            placement (Optional[Sequence[Tuple[Position, type, str]]]): Пользовательская расстановка.
+            size (int): Размер доски.
+        """
+        if placement is not None:
+            self.placement = placement
+        self.size = size
+
+    def create_board(self) -> chess.Board:
+        """Создает шахматную доску со стандартной или заданной расстановкой."""
+        if self.placement is None:
+            return chess.Board(size=self.size)
+        board = chess.Board(custom_setup=[[None for _ in range(self.size)] for _ in range(self.size)])
+        for position, piece_class, color in self.placement:
+            board.set_piece(position, piece_class(color))
+        return board
+
+    def board_moves(self, board, color: str, pending: Optional[Position] = None) -> List[Tuple[Position, ...]]:
+        """Возвращает допустимые ходы; если король стороны взят, ходов нет."""
+        if board.find_king(color) is None:
+            return []
+        return board.legal_moves(color)
+
+    def in_check(self, board, color: str) -> bool:
+        """Проверяет, что король стороны под шахом."""
+        return board.is_check(color)
+
+    def is_stalemate(self, board, color: str) -> bool:
+        """Отсутствие ходов — пат, если король на доске и не под шахом."""
+        return board.find_king(color) is not None and not board.is_check(color)
+
+    def requires_step(self, session: 'GameSession', start: Position, end: Position) -> bool:
+        """Проверяет по таблице ходов фигуры, что из `start` в `end` возможен только двухшаговый ход."""
+        piece = session.board.get_piece(start)
+        if piece is None or piece.color != session.current_player:
+            return False
+        table = piece.get_move_table(session.board.geometry)
+        options = table.routes[start].get(end, ())
+        return bool(options) and all(follow is not None for _, _, follow in options)
+
+    def apply_move(self, session: 'GameSession', start: Position, end: Position,
+                   step: Optional[Position] = None) -> MoveResult:
+        """Выполняет шахматный ход и сообщает о шахе противнику."""
+        board = session.board
+        piece = board.get_piece(start)
+        if piece is None or piece.color != session.current_player:
+            return MoveResult(WRONG_PIECE)
+        if not board.move_piece(start, end, step):
+            return MoveResult(ILLEGAL)
+        enemy = opponent(session.current_player)
+        return MoveResult(OK, check=enemy if self.in_check(board, enemy) else None)
+
+
+class FairyChessRules(ChessRules):
+    """Шахматы с нестандартными фигурами (Танцующий рыцарь, Дракон, Танк)."""
+
+    name = 'fairy'
+    placement = (
+        ((0, 7), chess.DancingKnight, 'black'),
+        ((7, 0), chess.DancingKnight, 'white'),
+        ((0, 1), chess.Dragon, 'black'),
+        ((7, 6), chess.Dragon, 'white'),
+        ((0, 5), chess.Tank, 'black'),
+        ((7, 2), chess.Tank, 'white'),
+        ((0, 4), chess.King, 'black'),
+        ((7, 4), chess.King, 'white'),
+        ((5, 5), chess.Pawn, 'black'),
+        ((3, 3), chess.Pawn, 'white'),
+    )
+
+
+class CheckersRules(Rules):
+    """Правила шашек: взятие обязательно, серия взятий продолжается той же шашкой.
+
+    Атрибуты:
+        size (int): Размер доски.
+    """
+
+    name = 'checkers'
+    board_type = checkers.Board
+    piece_values = {'O': 100, 'K': 300}
+    texts = {
+        'start': 'Введите координату шашки, которой хотите воспользоваться (например, a2): ',
+        'end': 'Введите координату, куда хотите ее передвинуть (например, a3): ',
+        WRONG_PIECE: 'Вы не можете ходить шашкой противника или пустой клеткой.',
+        ILLEGAL: 'Невозможно выполнить ход. Попробуйте снова.',
+    }
+
+    def __init__(self, size: int = 8):
+        """Инициализирует правила.
+
+        Аргументы:
+            size (int): Размер доски.
+        """
+        self.size = size
+
+    def create_board(self) -> checkers.Board:
+        """Создает шашечную доску в начальной позиции."""
+        return checkers.Board(self.size)
+
+    def required_moves(self, session: 'GameSession') -> List[Tuple[Position, Position]]:
+        """Возвращает обязательные взятия текущего игрока.
+
+        Во время серии взятий учитываются только взятия продолжающей ее шашки.
+        """
+        if session.pending is not None:
+            return session.board.captures_from(session.pending)
+        return session.board.capture_moves(session.current_player)
+
+    def board_moves(self, board, color: str, pending: Optional[Position] = None) -> List[Tuple[Position, Position]]:
+        """Возвращает допустимые ходы: при наличии взятий — только взятия."""
+        if pending is not None:
+            return board.captures_from(pending)
+        return list(board.iter_moves(color))
+
+    def search_moves(self, board, color: str,
+                     pending: Optional[Position] = None) -> Tuple[List[Tuple[Position, Position]], bool]:
+        """Возвращает взятия (если они есть, признак обязательных взятий True) или тихие ходы."""
+        if pending is not None:
+            return board.captures_from(pending), True
+        captures = board.capture_moves(color)
+        if captures:
+            return captures, True
+        return list(board.iter_quiet_moves(color)), False
+
+    def continues(self, board, end: Position, captures: bool) -> bool:
+        """Серия продолжается, если ход был взятием и шашка может взять еще раз."""
+        return captures and bool(board.captures_from(end))
+
+    def split_move(self, squares: Sequence[Position]) -> Optional[List[Tuple[Position, Position]]]:
+        """Разбивает серию взятий на отдельные взятия; простой ход — одна пара клеток."""
+        return list(zip(squares, squares[1:])) if len(squares) >= 2 else None
+
+    def parse_move(self, text: str, geometry) -> Optional[Tuple[Position, ...]]:
+        """Разбирает простой ход 'c3-d4' или серию взятий 'c3xe5xg7'."""
+        return notation.parse_chain(text, geometry)
+
+    def format_move(self, squares: Sequence[Position], capture: bool, geometry) -> str:
+        """Записывает простой ход 'c3-d4' или серию взятий 'c3xe5xg7'."""
+        return notation.format_chain(squares, capture, geometry)
+
+    def apply_move(self, session: 'GameSession', start: Position, end: Position,
+                   step: Optional[Position] = None) -> MoveResult:
+        """Выполняет ход шашкой с учетом обязательных взятий (двухшаговых ходов в шашках нет)."""
+        board = session.board
+        piece = board.get_piece(start)
+        if piece is None or piece.color != session.current_player:
+            return MoveResult(WRONG_PIECE)
+        if step is not None:
+            return MoveResult(ILLEGAL)
+
+        required = self.required_moves(session)
+        if required and (start, end) not in required:
+            return MoveResult(CAPTURE_REQUIRED)
+        if not board.move_piece(start, end):
+            return MoveResult(ILLEGAL)
+
+        if self.continues(board, end, bool(required)):
+            return MoveResult(OK, continues=True)
+        return MoveResult(OK)
+
+
+class GameSession:
+    """Состояние одной партии.
+
+    Атрибуты:
+        rules (Rules): Правила игры.
+        board: Доска партии.
+        current_player (str): Сторона, которая ходит ('white' или 'black').
+        move_counter (int): Количество завершенных ходов.
+        history (List[tuple]): Выполненные ходы (цвет, откуда, куда) или (цвет, откуда, клетка
+            приземления, клетка второго шага) для двухшагового хода; каждое взятие серии
+            записывается отдельно.
+        pending (Optional[Position]): Клетка шашки, обязанной продолжить серию взятий.
+        journal (Optional[persistence.MoveLog]): Журнал, в который записываются выполненные ходы.
+        publisher (Optional[snapshot.SnapshotPublisher]): Издатель снимков позиции для читателей
+            из других потоков.
+    """
+
+    __slots__ = ('rules', 'board', 'current_player', 'move_counter', 'history', 'pending', 'journal', 'publisher')
+
+    def __init__(self, rules: Rules, journal=None, publisher=None):
+        """Создает партию в начальной позиции.
+
+        Аргументы:
+            rules (Rules): Правила игры.
+            journal (Optional[persistence.MoveLog]): Журнал ходов (см. модуль `persistence`).
+            publisher (Optional[snapshot.SnapshotPublisher]): Издатель снимков (см. модуль
+                `snapshot`); снимок публикуется сразу и после каждого выполненного хода.
+        """
+        self.rules = rules
+        self.board = rules.create_board()
+        self.current_player = 'white'
+        self.move_counter = 0
+        self.history: List[tuple] = []
+        self.pending: Optional[Position] = None
+        self.journal = journal
+        self.publisher = publisher
+        if publisher is not None:
+            publisher.publish(self)
+
+    @classmethod
+    def from_state(cls, rules: Rules, board, current_player: str = 'white', move_counter: int = 0,
+                   pending: Optional[Position] = None) -> 'GameSession':
+        """Создает партию в заданной позиции, не строя начальную доску.
+
+        Партия создается без журнала, издателя снимков и истории ходов.
+
+        Аргументы:
+            rules (Rules): Правила игры.
+            board: Доска партии (используется без копирования).
+            current_player (str): Сторона, которая ходит.
+            move_counter (int): Количество завершенных ходов.
+            pending (Optional[Position]): Клетка шашки, обязанной продолжить серию взятий.
+
+        Возвращает:
+            GameSession: Партия в заданной позиции.
+        """
+        session = cls.__new__(cls)
+        session.rules = rules
+        session.board = board
+        session.current_player = current_player
+        session.move_counter = move_counter
+        session.history = []
+        session.pending = pending
+        session.journal = None
+        session.publisher = None
+        return session
+
+    def required_moves(self) -> List[Tuple[Position, Position]]:
+        """Возвращает ходы, один из которых текущий игрок обязан сделать."""
+        return self.rules.required_moves(self)
+
+    def legal_moves(self) -> List[Tuple[Position, ...]]:
+        """Возвращает все допустимые ходы текущего игрока (пустой список — партия окончена)."""
+        return self.rules.legal_moves(self)
+
+    def play(self, start: Optional[Position], end: Optional[Position], step: Optional[Position] = None) -> MoveResult:
+        """Обрабатывает ход текущего игрока.
+
+        После завершенного хода очередь переходит к противнику и счетчик ходов увеличивается;
+        если ход требует продолжения серии взятий, очередь не меняется.
+
+        Аргументы:
+            start (Optional[Position]): Начальная позиция; None — некорректный ввод.
+            end (Optional[Position]): Конечная позиция; None — некорректный ввод.
+            step (Optional[Position]): Клетка второго шага двухшагового хода.
+
+        Возвращает:
+            MoveResult: Результат хода.
+        """
+        if start is None or end is None:
+            return MoveResult(INVALID)
+        if self.pending is not None and start != self.pending:
+            return MoveResult(CAPTURE_REQUIRED)
+
+        result = self.rules.apply_move(self, start, end, step)
+        if not result.ok:
+            return result
+
+        self.history.append((self.current_player, start, end) if step is None
+                            else (self.current_player, start, end, step))
+        if result.continues:
+            self.pending = end
+        else:
+            self.pending = None
+            self.current_player = opponent(self.current_player)
+            self.move_counter += 1
+        if self.journal is not None:
+            self.journal.record(self, start, end, step)
+        if self.publisher is not None:
+            self.publisher.publish(self)
+        return result
+
+    def apply_moves(self, sequence) -> Optional[int]:
+        """Проверяет и выполняет сразу несколько ходов через `Board.apply_moves`.
+
+        Промежуточные шахи не вычисляются. Серия взятий в шашках передается одним ходом
+        из нескольких клеток, двухшаговый шахматный ход — тройкой клеток. Если какой-то ход
+        недопустим, партия не изменяется.
+
+        Аргументы:
+            sequence: Последовательность ходов, начиная с хода `current_player`.
+
+        Возвращает:
+            Optional[int]: Номер первого недопустимого хода или None, если все ходы выполнены.
+        """
+        if self.pending is not None:
+            return 0
+        sequence = list(sequence)
+        failed = self.board.apply_moves(sequence, self.current_player)
+        if failed is not None:
+            return failed
+
+        start_index = len(self.history)
+        normalize = self.board.geometry.normalize
+        for squares in sequence:
+            for step in self.rules.split_move(normalize(squares)):
+                self.history.append((self.current_player, *step))
+            self.current_player = opponent(self.current_player)
+            self.move_counter += 1
+        if self.journal is not None:
+            self.journal.record_many(self, self.history[start_index:])
+        if self.publisher is not None:
+            self.publisher.publish(self)
+        return None
+
+
+VARIANTS = {
+    'chess': ChessRules,
+    'fairy': FairyChessRules,
+    'checkers': CheckersRules,
+}
@@ -0,0 +1,148 @@
+"""Неизменяемые снимки позиции для чтения партии из нескольких потоков.
+
+`GameSession` меняет доску на месте (в том числе временно, при проверке
+ходов через make/unmake), поэтому читать ее из другого потока во время хода
+нельзя. `SnapshotPublisher` после каждого выполненного хода собирает новый
+`Snapshot` — упакованную доску (`Board.pack`) и состояние очереди — и
+публикует его одной заменой ссылки. Старые снимки никогда не изменяются:
+читатель, который уже получил снимок, дочитывает его без блокировок, даже
+если тем временем опубликован следующий.
+
+Запросы к снимку (отрисовка, шах, допустимые ходы) выполняются на частной
+доске, распакованной из снимка, и запоминаются в снимке, так что остальные
+читатели той же позиции получают готовый результат.
+
+Пример:
+    publisher = SnapshotPublisher()
+    session = GameSession(ChessRules(), publisher=publisher)
+    # поток-писатель: session.play(...)
+    # потоки-читатели: publisher.current.legal_moves()
+"""
+
+from threading import Condition
+from typing import Dict, List, Optional, Tuple
+
+from render import render_board
+from session import GameSession
+
+Position = Tuple[int, int]
+
+
+class Snapshot:
+    """Позиция партии в момент публикации.
+
+    Атрибуты:
+        rules (Rules): Правила игры.
+        packed (bytes): Упакованная доска.
+        current_player (str): Сторона, которая ходит.
+        move_counter (int): Количество завершенных ходов.
+        pending (Optional[Position]): Клетка шашки, обязанной продолжить серию взятий.
+        version (int): Номер снимка; увеличивается с каждой публикацией.
+    """
+
+    __slots__ = ('rules', 'packed', 'current_player', 'move_counter', 'pending', 'version', '_results')
+
+    def __init__(self, session, version: int):
+        """Снимает позицию партии.
+
+        Аргументы:
+            session (GameSession): Партия (вызывается писателем между ходами).
+            version (int): Номер снимка.
+        """
+        self.rules = session.rules
+        self.packed = session.board.pack()
+        self.current_player = session.current_player
+        self.move_counter = session.move_counter
+        self.pending = session.pending
+        self.version = version
+        self._results: Dict[tuple, object] = {}
+
+    def board(self):
+        """Возвращает новую доску с позицией снимка; ее можно изменять.
+
+        Возвращает:
+            Board: Распакованная доска.
+        """
+        return self.rules.board_type.unpack(self.packed)
+
+    def _session(self):
+        """Создает частную партию в позиции снимка для запросов к правилам."""
+        return GameSession.from_state(self.rules, self.board(), self.current_player, self.move_counter, self.pending)
+
+    def _cached(self, key: tuple, compute):
+        """Возвращает запомненный результат запроса или вычисляет и запоминает его."""
+        try:
+            return self._results[key]
+        except KeyError:
+            result = self._results[key] = compute()
+            return result
+
+    def render(self) -> str:
+        """Возвращает строковое представление доски (см. `render.render_board`)."""
+        return self._cached(('render',), lambda: render_board(self.board()))
+
+    def is_check(self, color: Optional[str] = None) -> bool:
+        """Проверяет, находится ли король стороны под шахом.
+
+        Аргументы:
+            color (Optional[str]): Сторона; по умолчанию — та, что ходит.
+
+        Возвращает:
+            bool: True, если король под шахом (см. `Rules.in_check`; в шашках всегда False).
+        """
+        color = color or self.current_player
+        return self._cached(('check', color), lambda: self.rules.in_check(self.board(), color))
+
+    def legal_moves(self) -> List[Tuple[Position, ...]]:
+        """Возвращает допустимые ходы стороны, которая ходит (см. `Rules.legal_moves`).
+
+        Возвращает:
+            List[Tuple[Position, ...]]: Новый список ходов.
+        """
+        return list(self._cached(('legal',), lambda: tuple(self.rules.legal_moves(self._session()))))
+
+
+class SnapshotPublisher:
+    """Публикует снимки партии после каждого хода.
+
+    Атрибуты:
+        current (Optional[Snapshot]): Последний опубликованный снимок.
+    """
+
+    def __init__(self):
+        """Создает издателя без снимков; первый снимок публикуется при создании партии."""
+        self.current: Optional[Snapshot] = None
+        self._changed = Condition()
+
+    def publish(self, session) -> Snapshot:
+        """Снимает позицию партии и делает снимок текущим.
+
+        Вызывается `GameSession` из потока-писателя после каждого выполненного хода.
+
+        Аргументы:
+            session (GameSession): Партия.
+
+        Возвращает:
+            Snapshot: Опубликованный снимок.
+        """
+        previous = self.current
+        snapshot = Snapshot(session, 0 if previous is None else previous.version + 1)
+        self.current = snapshot
+        with self._changed:
+            self._changed.notify_all()
+        return snapshot
+
+    def wait(self, version: int, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """Ожидает снимок новее указанной версии.
+
+        Аргументы:
+            version (int): Версия, которую читатель уже видел.
+            timeout (Optional[float]): Наибольшее время ожидания, секунды.
+
+        Возвращает:
+            Optional[Snapshot]: Текущий снимок или None, если новый не появился за `timeout`.
+        """
+        with self._changed:
+            if self._changed.wait_for(lambda: self.current is not None and self.current.version > version, timeout):
+                return self.current
+        return None
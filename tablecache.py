@@ -0,0 +1,130 @@
+"""Кэш предвычисленных таблиц на диске.
+
+Таблицы геометрии и таблицы ходов фигур строятся при первом обращении, а
+затем сохраняются в файлы (формат `marshal`). При следующих запусках файл
+отображается в память (`mmap`) и разбирается без повторного построения, так
+что короткоживущие процессы не тратят время на предвычисления.
+
+Ключ файла кэша включает хэш исходных текстов модулей, которые строят
+таблицы (`SOURCES`), поэтому после любого изменения их кода старые файлы
+не используются. Каталог кэша задается переменной окружения
+PRPROGER_CACHE_DIR (по умолчанию `__pycache__/tables` рядом с модулем);
+PRPROGER_NO_TABLE_CACHE=1 отключает кэш. Ошибки чтения и записи кэша не
+считаются ошибками: таблица просто строится заново.
+
+Запуск `python tablecache.py` заранее строит таблицы всех фигур для досок 8x8 и 10x10.
+"""
+
+import marshal
+import mmap
+import os
+import zlib
+
+CACHE_VERSION = 2
+SOURCES = ('geometry.py', 'movement.py', 'tablecache.py')
+CACHE_DIR = os.environ.get('PRPROGER_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'tables')
+enabled = not os.environ.get('PRPROGER_NO_TABLE_CACHE')
+
+
+def _source_hash() -> str:
+    """Возвращает хэш исходных текстов `SOURCES` или пустую строку, если их не удалось прочитать."""
+    digest = 0
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        for name in SOURCES:
+            with open(os.path.join(directory, name), 'rb') as file:
+                digest = zlib.crc32(file.read(), digest)
+    except OSError:
+        return ''
+    return f"{digest:08x}"
+
+
+SOURCE_HASH = _source_hash()
+if not SOURCE_HASH:
+    enabled = False
+
+
+def _full_key(kind: str, key: str) -> str:
+    """Возвращает ключ таблицы с версией формата и хэшем исходных текстов."""
+    return f"{CACHE_VERSION}:{SOURCE_HASH}:{kind}:{key}"
+
+
+def _path(kind: str, key: str) -> str:
+    """Возвращает путь к файлу кэша для таблицы."""
+    digest = zlib.crc32(_full_key(kind, key).encode())
+    return os.path.join(CACHE_DIR, f"{kind}-{digest:08x}.bin")
+
+
+def load(kind: str, key: str):
+    """Загружает таблицу из кэша.
+
+    Аргументы:
+        kind (str): Вид таблицы ('geometry', 'moves').
+        key (str): Ключ таблицы; сохраняется в файле (вместе с хэшем исходных текстов)
+            и сверяется при загрузке.
+
+    Возвращает:
+        Данные таблицы или None, если в кэше ее нет.
+    """
+    if not enabled:
+        return None
+    try:
+        with open(_path(kind, key), 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                stored_key, data = marshal.loads(mapped)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    return data if stored_key == _full_key(kind, key) else None
+
+
+def store(kind: str, key: str, data):
+    """Сохраняет таблицу в кэш.
+
+    Файл сначала пишется во временный файл с уникальным именем, а затем атомарно
+    переименовывается, поэтому одновременно работающие процессы и потоки не увидят
+    недописанный файл и не помешают друг другу.
+
+    Аргументы:
+        kind (str): Вид таблицы ('geometry', 'moves').
+        key (str): Ключ таблицы.
+        data: Данные из встроенных типов (кортежи, словари, строки, числа).
+    """
+    if not enabled:
+        return
+    import tempfile
+
+    path = _path(kind, key)
+    temporary = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(path), dir=CACHE_DIR)
+        with os.fdopen(handle, 'wb') as file:
+            marshal.dump((_full_key(kind, key), data), file)
+        os.replace(temporary, path)
+    except OSError:
+        if temporary is not None:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+
+def warm_up(sizes=(8, 10)):
+    """Строит и сохраняет таблицы геометрии и таблицы ходов всех шахматных фигур.
+
+    Аргументы:
+        sizes: Размеры досок.
+    """
+    import chess
+    from geometry import get_geometry
+
+    for size in sizes:
+        geometry = get_geometry(size)
+        for piece_class in chess.PIECE_CLASSES:
+            for color in ('white', 'black'):
+                piece_class.movement.table(color, geometry)
+
+
+if __name__ == '__main__':
+    warm_up()